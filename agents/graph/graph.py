@@ -8,9 +8,11 @@ LangGraph의 StateGraph를 사용하여 명확하고 시각화 가능한 에이
 - 무한 루프 방지: 핸드오프 횟수 제한
 """
 
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 import os
+import threading
 from langgraph.graph import StateGraph
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from langchain_core.messages import HumanMessage
@@ -307,6 +309,11 @@ class TeamHGraph(NodesMixin):
 
         self.router_llm = create_llm()
 
+        # 정규화한 요청 문장 → 라우팅 결정 LRU 캐시 (반복되는 요청은 Router LLM 호출 생략)
+        self._routing_cache: "OrderedDict[str, AgentRouting]" = OrderedDict()
+        self._routing_cache_max = 256
+        self._routing_cache_lock = threading.Lock()
+
         # 프롬프트 파일 경로
         prompts_dir = Path(__file__).parent.parent / "prompts"
         router_template_path = prompts_dir / "router.yaml"
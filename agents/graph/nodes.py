@@ -63,23 +63,29 @@ class NodesMixin:
                 }
             )
 
-        # 첫 턴: Router LLM 호출
+        # 첫 턴: Router LLM 호출 (같은 요청에 대한 이전 결정이 있으면 재사용)
         last_message = state["messages"][-1].content
+        cache_key = self._routing_cache_key(last_message)
+        routing = self._routing_cache_get(cache_key)
 
-        print(f"[🔀] Router analyzing request (first turn)...")
-
-        # config 빌드
-        router_config = self._build_node_config(config)
-
-        # structured output으로 라우팅 결정
-        routing_agent = self.router_llm.with_structured_output(self.AgentRouting)
-        routing = routing_agent.invoke(
-            [
-                {"role": "system", "content": self.router_prompt},
-                {"role": "user", "content": last_message}
-            ],
-            config=router_config
-        )
+        if routing is not None:
+            print("[🔀] Router: Reusing cached decision for identical request")
+        else:
+            print(f"[🔀] Router analyzing request (first turn)...")
+
+            # config 빌드
+            router_config = self._build_node_config(config)
+
+            # structured output으로 라우팅 결정
+            routing_agent = self.router_llm.with_structured_output(self.AgentRouting)
+            routing = routing_agent.invoke(
+                [
+                    {"role": "system", "content": self.router_prompt},
+                    {"role": "user", "content": last_message}
+                ],
+                config=router_config
+            )
+            self._routing_cache_put(cache_key, routing)
 
         print(f"[🔀] Routing to Manager {routing.target_agent.upper()}: {routing.reason}")
 
@@ -95,6 +101,27 @@ class NodesMixin:
             }
         )
 
+    @staticmethod
+    def _routing_cache_key(message: Any) -> str:
+        """라우팅 캐시 키 (공백/대소문자 차이는 같은 요청으로 취급)"""
+        return " ".join(str(message).split()).lower()
+
+    def _routing_cache_get(self, key: str):
+        """캐시된 라우팅 결정 조회 (hit 시 최근 사용으로 갱신)"""
+        with self._routing_cache_lock:
+            routing = self._routing_cache.get(key)
+            if routing is not None:
+                self._routing_cache.move_to_end(key)
+            return routing
+
+    def _routing_cache_put(self, key: str, routing):
+        """라우팅 결정 저장 (최대 개수 초과 시 가장 오래된 항목 제거)"""
+        with self._routing_cache_lock:
+            self._routing_cache[key] = routing
+            self._routing_cache.move_to_end(key)
+            while len(self._routing_cache) > self._routing_cache_max:
+                self._routing_cache.popitem(last=False)
+
     def _create_manager_node(self, manager_key: str):
         """
         Manager 노드 함수 생성 헬퍼
@@ -215,10 +242,12 @@ class NodesMixin:
         """결과에서 마지막 AI 메시지 추출"""
         messages = result.get("messages", [])
 
-        for msg in reversed(messages):
-            if isinstance(msg, AIMessage):
-                return msg.content
-            elif hasattr(msg, "type") and msg.type == "ai":
-                return msg.content
+        # 최근 메시지부터 확인 (대부분 type 비교에서 바로 판별, 찾으면 즉시 중단)
+        last_ai = next(
+            (msg for msg in reversed(messages) if getattr(msg, "type", None) == "ai" or isinstance(msg, AIMessage)),
+            None,
+        )
+        if last_ai is not None:
+            return last_ai.content
 
         return "No response from agent"
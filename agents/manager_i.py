@@ -57,6 +57,16 @@ class ManagerI(AgentBase):
         "cube": "switch.cube",  # 큐브 공기청정기
     }
 
+    # 초기화 시 반드시 매핑되어 있어야 하는 장치
+    REQUIRED_ENTITIES = frozenset({
+        "living_room_light",
+        "bedroom_light",
+        "speaker",
+        "rice_cooker",
+        "submonitor",
+        "cube",
+    })
+
     # 장치 별칭 매핑 (한글/영어 모두 지원)
     DEVICE_ALIASES = {
         # Living room light
@@ -173,18 +183,9 @@ class ManagerI(AgentBase):
 
     def _validate_entity_config(self):
         """초기화 시 Entity 설정 검증"""
-        required_entities = [
-            "living_room_light",
-            "bedroom_light",
-            "speaker",
-            "rice_cooker",
-            "submonitor",
-            "cube"
-        ]
-
-        missing_entities = [e for e in required_entities if e not in self.entity_map]
+        missing_entities = self.REQUIRED_ENTITIES.difference(self.entity_map)
         if missing_entities:
-            print(f"[⚠️] 경고: 일부 Entity가 설정되지 않았습니다: {missing_entities}")
+            print(f"[⚠️] 경고: 일부 Entity가 설정되지 않았습니다: {', '.join(sorted(missing_entities))}")
             print(f"[⚠️] 이 장치들에 대한 제어 명령은 실패할 수 있습니다.")
             print(f"[⚠️] Home Assistant에서 SmartThings Integration 설정 후 entity_id를 확인하세요.")
 
@@ -99,7 +99,7 @@ async def lifespan(app: FastAPI):
         embedding_type=os.getenv("EMBEDDING_TYPE", "openai"),
         embedder_url=os.getenv("EMBEDDER_URL"),
         openai_api_key=os.getenv("OPENAI_API_KEY"),
-        embedding_dims=int(os.getenv("OPENAI_EMBEDDING_DIMS", "3072")) if os.getenv("EMBEDDING_TYPE") == "openai" else int(os.getenv("FASTAPI_EMBEDDING_DIMS", "1024")),
+        embedding_dims=int(os.getenv("OPENAI_EMBEDDING_DIMS", "1024")) if os.getenv("EMBEDDING_TYPE") == "openai" else int(os.getenv("FASTAPI_EMBEDDING_DIMS", "1024")),
         qdrant_url=os.getenv("QDRANT_URL", "http://localhost:6333"),
         qdrant_api_key=os.getenv("QDRANT_PASSWORD"),
         m_collection_name=os.getenv("MANAGER_M_COLLECTION", "manager_m_memories"),
@@ -254,7 +254,9 @@ async def test_api_client():
     """
     API 클라이언트 테스트 함수
     """
+    import asyncio
     import os
+    import sys
     from dotenv import load_dotenv
 
     load_dotenv()
@@ -264,22 +266,23 @@ async def test_api_client():
         token=os.getenv("HOMEASSISTANT_TOKEN")
     )
 
-    # Health check
-    if await client.health_check():
+    # Health check와 전체 entity 조회를 동시에 요청 (네트워크 왕복 2회를 겹침)
+    healthy, states = await asyncio.gather(
+        client.health_check(), client.get_states(), return_exceptions=True
+    )
+    if healthy is True and not isinstance(states, BaseException):
         print("✅ Home Assistant API 연결 성공")
     else:
         print("❌ Home Assistant API 연결 실패")
         return
 
-    # 모든 entity 조회
-    states = await client.get_states()
     print(f"\n📊 총 {len(states)}개의 entity 발견")
 
-    # Light entity만 필터링
+    # Light entity만 필터링 (entity마다 print하지 않고 한 번에 출력)
     lights = [s for s in states if s.entity_id.startswith("light.")]
-    print(f"💡 조명: {len(lights)}개")
-    for light in lights[:5]:  # 처음 5개만 출력
-        print(f"  - {light.entity_id}: {light.state}")
+    lines = [f"💡 조명: {len(lights)}개"]
+    lines.extend(f"  - {light.entity_id}: {light.state}" for light in lights[:5])  # 처음 5개만 출력
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
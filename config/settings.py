@@ -54,6 +54,16 @@ class QdrantConfig(BaseSettings):
         default="manager_m_memories",
         description="Manager M 컬렉션 이름"
     )
+    qdrant_prefer_grpc: bool = Field(
+        default=False,
+        description="Qdrant gRPC 전송 사용 여부 (REST 대비 낮은 지연, gRPC 포트 개방 필요)"
+    )
+    qdrant_grpc_port: int = Field(default=6334, description="Qdrant gRPC 포트")
+    qdrant_pool_size: int = Field(default=100, description="Qdrant REST 연결 풀 크기")
+    payload_index_fields: Dict[str, str] = Field(
+        default={"user_id": "keyword", "thread_id": "keyword", "entity_id": "keyword"},
+        description="VectorStore 컬렉션에 payload 인덱스를 만들 metadata 필드 → 스키마 (keyword, integer, float 등)"
+    )
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -79,8 +89,16 @@ class EmbeddingConfig(BaseSettings):
         description="FastAPI 임베딩 차원"
     )
     openai_embedding_dims: int = Field(
-        default=3072,
-        description="OpenAI 임베딩 차원 (text-embedding-3-large)"
+        default=1024,
+        description="OpenAI 임베딩 차원 (text-embedding-3-large, 최대 3072)"
+    )
+    warmup_sparse: bool = Field(
+        default=True,
+        description="VectorStore 생성 시 BM25 sparse 모델을 미리 한 번 실행 (첫 검색 지연 제거)"
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.0,
+        description="VectorStore 시맨틱 캐시 코사인 유사도 임계값 (기본 0: 비활성화, 사용 시 0.95 권장)"
     )
 
     model_config = SettingsConfigDict(
@@ -1,51 +1,100 @@
 # vector_store_teamh.py
-from functools import wraps
+import asyncio
+from functools import lru_cache, wraps
 from langchain.embeddings.base import Embeddings
 from langchain_qdrant import FastEmbedSparse, QdrantVectorStore, RetrievalMode
-from qdrant_client import QdrantClient, models
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
 from qdrant_client.http.models import Distance, SparseVectorParams, VectorParams, Filter, FieldCondition, MatchValue, MatchAny
 from langchain_core.documents import Document
-from collections import defaultdict
-import traceback
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+import logging
+import numpy as np
+import threading
 import time
+import uuid
 from typing import Optional, Dict, Any, List, Set
 from database.qdrant.fastapi_embedder_adapter import FastAPIEmbedderAdapter
 from database.qdrant.openai_embedder_adapter import OpenAIEmbedderAdapter
 from database.qdrant.config import MemoryConfig
 
+logger = logging.getLogger(__name__)
+
+
 def timing_step(func):
+    """DEBUG 로그가 켜져 있을 때만 실행 시간을 기록 (꺼져 있으면 원 함수 그대로 호출)"""
     @wraps(func)
     def wrapper(*args, **kwargs):
-        print(f"\n[⏱️] Starting '{func.__name__}'...")
-        start_time = time.time()
+        if not logger.isEnabledFor(logging.DEBUG):
+            return func(*args, **kwargs)
+        start_ns = time.monotonic_ns()
         result = func(*args, **kwargs)
-        elapsed = time.time() - start_time
-        print(f"[✅] Finished '{func.__name__}' in {elapsed:.2f} seconds\n")
+        logger.debug("%s finished in %.2fms", func.__name__, (time.monotonic_ns() - start_ns) / 1e6)
         return result
     return wrapper
 
-def create_qdrant_filter(metadata_filter: Optional[Dict[str, Any]]) -> Optional[Filter]:
-    """`None`, `"None"`, 빈 리스트는 무시하고 조건을 만든다."""
-    if not metadata_filter:
-        return None
 
-    conditions = []
+def _iter_conditions(metadata_filter: Dict[str, Any]):
+    """`None`, `"None"`, 빈 리스트를 건너뛰며 FieldCondition을 한 번에 하나씩 생성"""
     for field, value in metadata_filter.items():
-        if value is None or \
-            value == "None" or \
-            (isinstance(value, list) and not value):
+        if value is None or value == "None":
             continue
-
         key = f"metadata.{field}"
         if isinstance(value, list):
-            conditions.append(FieldCondition(key=key, match=MatchAny(any=value)))
+            if not value:
+                continue
+            yield FieldCondition(key=key, match=MatchAny(any=value))
         else:
-            conditions.append(FieldCondition(key=key, match=MatchValue(value=value)))
+            yield FieldCondition(key=key, match=MatchValue(value=value))
 
+
+def _build_filter(metadata_filter: Dict[str, Any]) -> Optional[Filter]:
+    """metadata_filter dict → Filter (조건이 없으면 None)"""
+    conditions = list(_iter_conditions(metadata_filter))
     return Filter(must=conditions) if conditions else None
 
 
+@lru_cache(maxsize=512)
+def _cached_filter(frozen: tuple) -> Optional[Filter]:
+    """고정된 필터 시그니처별 Filter (세션마다 같은 user_id 필터를 재사용, 호출 측에서 수정하지 않음)"""
+    return _build_filter({field: list(value) if type(value) is tuple else value for field, _, value in frozen})
+
+
+def _value_type(value: Any):
+    """캐시 키용 값 타입 (True == 1 == 1.0이 같은 키가 되지 않도록, 리스트는 원소 타입까지)"""
+    if type(value) is list:
+        return tuple(type(item).__name__ for item in value)
+    return type(value).__name__
+
+
+def create_qdrant_filter(metadata_filter: Optional[Dict[str, Any]]) -> Optional[Filter]:
+    """`None`, `"None"`, 빈 리스트는 무시하고 조건을 만든다."""
+    if not metadata_filter:
+        return None
+
+    # 리스트는 tuple로 고정하고 값 타입과 함께 캐시 키로 사용 (tuple 값이나 해시 불가능한 값은 캐시 없이 생성)
+    if not any(type(value) is tuple for value in metadata_filter.values()):
+        try:
+            frozen = tuple(sorted(
+                (field, _value_type(value), tuple(value) if type(value) is list else value)
+                for field, value in metadata_filter.items()
+            ))
+            return _cached_filter(frozen)
+        except TypeError:
+            pass
+    return _build_filter(metadata_filter)
+
+
 class VectorStore:
+    # INT8 양자화 벡터로 후보를 넓게 뽑은 뒤 원본 float32로 재채점해 recall 유지
+    DENSE_SEARCH_PARAMS = models.SearchParams(
+        quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0),
+    )
+
+    # 하이브리드 검색: dense/sparse 후보를 각각 k * HYBRID_PREFETCH_FACTOR개 뽑아 Qdrant 내부에서 결합
+    HYBRID_PREFETCH_FACTOR = 4
+    HYBRID_FUSION = models.FusionQuery(fusion=models.Fusion.RRF)
+
     @timing_step
     def __init__(
         self,
@@ -57,6 +106,7 @@ class VectorStore:
         embedding_type=None,
         embedder_url=None,
         openai_api_key=None,
+        prefer_grpc=None,
     ):
         """
         VectorStore 초기화
@@ -70,6 +120,7 @@ class VectorStore:
             embedding_type: 임베딩 타입 ("fastapi" 또는 "openai", 기본값: config에서 로드)
             embedder_url: FastAPI 임베딩 서버 URL (embedding_type="fastapi"일 때 사용)
             openai_api_key: OpenAI API 키 (embedding_type="openai"일 때 사용)
+            prefer_grpc: Qdrant gRPC 전송 사용 여부 (기본값: config에서 로드, 연결 실패 시 REST로 대체)
         """
         self.url = url
         self.api_key = api_key
@@ -80,52 +131,113 @@ class VectorStore:
         embedding_type = embedding_type or MemoryConfig.EMBEDDING_TYPE
 
         # Qdrant 클라이언트 초기화
-        client_args = {'url': url, 'timeout': 60}
-        if api_key:
-            client_args['api_key'] = api_key
-        self.client = QdrantClient(**client_args)
+        if prefer_grpc is None:
+            prefer_grpc = MemoryConfig.QDRANT_PREFER_GRPC
+        self.client = self._create_client(prefer_grpc)
+        # 비동기 적재용 클라이언트는 이벤트 루프 안에서 처음 사용할 때 생성 (같은 전송 설정 사용)
+        self._aclient: Optional[AsyncQdrantClient] = None
+
+        # 검색 쿼리 → (dense, sparse) 벡터 LRU 캐시 (같은 쿼리 재검색 시 임베딩 생략)
+        self._embed_cache: "OrderedDict[str, tuple[List[float], models.SparseVector]]" = OrderedDict()
+        self._embed_cache_max = 1024
+        self._embed_cache_lock = threading.Lock()
+        # 같은 쿼리를 동시에 임베딩 중이면 뒤 호출은 먼저 시작한 요청의 결과를 기다림 (캐시 lock 공유)
+        self._inflight: Dict[str, Future] = {}
+
+        # 시맨틱 결과 캐시 (opt-in, 임계값 0이면 비활성화): 과거 쿼리의 정규화 dense 벡터(링 버퍼)와 검색 결과
+        # 새 쿼리와 코사인 유사도가 임계값을 넘고 k/필터가 같으면 Qdrant 검색을 생략
+        # 문서 추가/컬렉션 삭제·재생성 시 비움
+        self._sem_cache_threshold = MemoryConfig.SEMANTIC_CACHE_THRESHOLD or 0.0
+        self._sem_cache_max = 512
+        self._sem_cache_vecs: Optional[np.ndarray] = None  # 첫 저장 시 [max, dim]으로 할당
+        self._sem_cache_entries: List[tuple] = []  # (cache_key, results), 벡터 행과 같은 인덱스
+        self._sem_cache_pos = 0
+        self._sem_cache_lock = threading.Lock()
+
+        # sparse(BM25 모델 로드)와 dense(서버 연결) embedder는 서로 독립적이므로 동시에 초기화
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            sparse_future = executor.submit(self._create_sparse_embedder)
+            dense_future = executor.submit(
+                self._make_dense_embedder, embedding_type, embedder_url, openai_api_key, dense_size
+            )
+            self.sparse_embedder = sparse_future.result()
+            self.embedder, self.dense_size = dense_future.result()
 
-        self.sparse_embedder = self._create_sparse_embedder()
+        self.embedding_type = embedding_type
+
+        self._ensure_collection_exists()
+        self.vector_store = self._create_vector_store()
 
-        # 임베딩 타입에 따라 embedder 초기화
+    @staticmethod
+    def _make_dense_embedder(embedding_type, embedder_url, openai_api_key, dense_size):
+        """임베딩 타입에 따라 dense embedder 생성 (embedder, dense_size) 반환"""
         if embedding_type == "fastapi":
             embedder_url = embedder_url or MemoryConfig.EMBEDDER_URL
             dense_size = dense_size or MemoryConfig.FASTAPI_EMBEDDING_DIMS
 
             print(f"[🔗] Initializing FastAPI Embedder: {embedder_url}")
-            self.embedder = FastAPIEmbedderAdapter(
+            embedder = FastAPIEmbedderAdapter(
                 base_url=embedder_url,
                 retry_attempts=3,
                 retry_delay=2,
                 timeout=60
             )
-            self.dense_size = dense_size
+            return embedder, dense_size
 
-        elif embedding_type == "openai":
+        if embedding_type == "openai":
             openai_api_key = openai_api_key or MemoryConfig.OPENAI_API_KEY
             dense_size = dense_size or MemoryConfig.OPENAI_EMBEDDING_DIMS
 
             print(f"[🔗] Initializing OpenAI Embedder: text-embedding-3-large")
-            self.embedder = OpenAIEmbedderAdapter(
+            embedder = OpenAIEmbedderAdapter(
                 api_key=openai_api_key,
                 dimensions=dense_size,
             )
-            self.dense_size = dense_size
-
+            return embedder, dense_size
+
+        raise ValueError(f"Invalid embedding_type: {embedding_type}. Must be 'fastapi' or 'openai'.")
+
+    def _client_kwargs(self, prefer_grpc: bool) -> Dict[str, Any]:
+        """QdrantClient/AsyncQdrantClient 공통 인자"""
+        client_args = {'url': self.url, 'timeout': 60}
+        if self.api_key:
+            client_args['api_key'] = self.api_key
+        if prefer_grpc:
+            # gRPC 채널은 하나의 HTTP/2 연결을 유지하며 요청을 다중화 (keepalive로 유휴 연결 유지)
+            client_args.update(
+                prefer_grpc=True,
+                grpc_port=MemoryConfig.QDRANT_GRPC_PORT,
+                grpc_options={"grpc.keepalive_time_ms": 30000},
+            )
         else:
-            raise ValueError(f"Invalid embedding_type: {embedding_type}. Must be 'fastapi' or 'openai'.")
-
-        self.embedding_type = embedding_type
-
-        self._ensure_collection_exists()
-        self.vector_store = self._create_vector_store()
+            client_args['pool_size'] = MemoryConfig.QDRANT_POOL_SIZE
+        return client_args
+
+    def _create_client(self, prefer_grpc: bool) -> QdrantClient:
+        """Qdrant 클라이언트 생성 (gRPC 포트에 연결할 수 없으면 REST로 대체)"""
+        if prefer_grpc:
+            client = QdrantClient(**self._client_kwargs(prefer_grpc=True))
+            try:
+                client.get_collections()
+                self._client_args = self._client_kwargs(prefer_grpc=True)
+                logger.info("Connected to Qdrant via gRPC: %s", self.url)
+                return client
+            except Exception as e:
+                logger.warning("Qdrant gRPC connection failed (%s). Falling back to REST.", e)
+                client.close()
+
+        self._client_args = self._client_kwargs(prefer_grpc=False)
+        return QdrantClient(**self._client_args)
 
     @staticmethod
     def _filter_internal_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
-        """메타데이터에서 '_'로 시작하는 내부 키를 필터링합니다."""
+        """메타데이터에서 '_'로 시작하는 내부 키를 제거합니다. (검색 결과마다 새로 만든 dict이므로 제자리 수정)"""
         if not metadata:
             return {}
-        return {k: v for k, v in metadata.items() if not k.startswith('_')}
+        internal = [k for k in metadata if k and k[0] == '_']
+        for k in internal:
+            del metadata[k]
+        return metadata
 
     @timing_step
     def delete_collection(self):
@@ -133,6 +245,7 @@ class VectorStore:
         try:
             print(f"Attempting to delete collection '{self.collection_name}'...")
             self.client.delete_collection(collection_name=self.collection_name)
+            self._clear_semantic_cache()
             print(f"Collection '{self.collection_name}' deleted successfully")
             return True
         except Exception as e:
@@ -161,20 +274,78 @@ class VectorStore:
                 self.create_collection()
             else:
                 print(f"Collection '{self.collection_name}' already exists and recreate=False.")
+                self._match_existing_dims()
+
+            self._ensure_payload_indexes()
 
         except Exception as e:
             print(f"[❌] Error ensuring collection exists: {e}")
             raise
 
+    def _match_existing_dims(self):
+        """
+        기존 컬렉션의 dense 벡터 차원과 설정 차원이 다를 때 처리 (ManagerMMemory와 동일)
+
+        OpenAI 임베더는 dimensions 파라미터로 임의 차원을 받을 수 있으므로
+        기존 컬렉션(예: 이전 기본값 3072) 차원에 맞춰 계속 사용하고, 그 외에는 바로 오류를 냅니다.
+        (차원이 다르면 적재/검색이 실패하는데 search는 오류 시 빈 결과를 반환하므로 초기화 시점에 확인)
+        """
+        vectors = self.client.get_collection(self.collection_name).config.params.vectors
+        existing_dims = vectors["dense"].size if isinstance(vectors, dict) else vectors.size
+        if existing_dims == self.dense_size:
+            return
+
+        if self.embedding_type == "openai":
+            logger.warning(
+                "Collection '%s' uses %d dims (configured: %d). Using %d dims for this collection.",
+                self.collection_name, existing_dims, self.dense_size, existing_dims,
+            )
+            self.embedder.dimensions = existing_dims
+            self.dense_size = existing_dims
+        else:
+            raise ValueError(
+                f"Collection '{self.collection_name}' uses {existing_dims} dims, "
+                f"but the {self.embedding_type} embedder produces {self.dense_size} dims."
+            )
+
+    def _ensure_payload_indexes(self):
+        """자주 필터링하는 metadata 필드의 payload 인덱스 생성 (이미 있으면 건너뜀)"""
+        existing = self.client.get_collection(self.collection_name).payload_schema
+        for field, schema in MemoryConfig.PAYLOAD_INDEX_FIELDS.items():
+            field_name = f"metadata.{field}"
+            if field_name in existing:
+                continue
+            logger.info("Creating payload index: %s (%s)", field_name, schema)
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field_name,
+                field_schema=models.PayloadSchemaType(schema),
+            )
+
     @timing_step
     def create_collection(self):
         """Create a collection with both dense and sparse vectors"""
         try:
             self.client.create_collection(
                 collection_name=self.collection_name,
-                vectors_config={"dense": VectorParams(size=self.dense_size, distance=Distance.COSINE)},
+                vectors_config={
+                    "dense": VectorParams(
+                        size=self.dense_size,
+                        distance=Distance.COSINE,
+                        # 원본 float32는 디스크에 두고 INT8 양자화 벡터(1/4 크기)만 RAM에 유지
+                        on_disk=True,
+                        quantization_config=models.ScalarQuantization(
+                            scalar=models.ScalarQuantizationConfig(
+                                type=models.ScalarType.INT8,
+                                quantile=0.99,
+                                always_ram=True,
+                            ),
+                        ),
+                    )
+                },
                 sparse_vectors_config={"sparse": SparseVectorParams(index=models.SparseIndexParams(on_disk=False))},
             )
+            self._clear_semantic_cache()
             print(f"Collection '{self.collection_name}' created successfully")
         except Exception as e:
             print(f"[❌] Error creating collection '{self.collection_name}': {e}")
@@ -182,7 +353,14 @@ class VectorStore:
 
     @timing_step
     def _create_sparse_embedder(self):
-        return FastEmbedSparse(model_name="Qdrant/bm25")
+        sparse_embedder = FastEmbedSparse(model_name="Qdrant/bm25")
+        if MemoryConfig.WARMUP_SPARSE:
+            # 토크나이저/어휘 로드를 첫 사용자 검색이 아닌 초기화 시점(dense 초기화와 병렬)에 수행
+            try:
+                sparse_embedder.embed_query("warmup")
+            except Exception as e:
+                logger.warning("Sparse embedder warmup failed: %s", e)
+        return sparse_embedder
 
     @timing_step
     def _create_vector_store(self):
@@ -192,12 +370,8 @@ class VectorStore:
         if not self.sparse_embedder:
              print("[⚠️] Sparse embedder is not available. Hybrid search might not work as expected.")
 
-        try:
-            _ = self.embedder.embed_query("connection test")
-            print("[✅] Embedder connection verified before creating VectorStore.")
-        except Exception as e:
-            print(f"[❌] Failed to verify embedder connection: {e}")
-
+        # 임베딩 호출로 연결을 확인하지 않음: FastAPI 어댑터는 생성 시 /health를 (URL당 1회) 확인하고,
+        # OpenAI는 첫 실제 호출에서 인증이 검증됨
         return QdrantVectorStore(
             client=self.client,
             collection_name=self.collection_name,
@@ -208,57 +382,353 @@ class VectorStore:
             sparse_vector_name="sparse",
         )
 
+    def _get_async_client(self) -> AsyncQdrantClient:
+        """비동기 Qdrant 클라이언트 (인스턴스당 1개 재사용)"""
+        if self._aclient is None:
+            self._aclient = AsyncQdrantClient(**self._client_args)
+        return self._aclient
+
+    async def aclose(self):
+        """비동기 클라이언트(Qdrant, embedder) 종료"""
+        if self._aclient is not None:
+            await self._aclient.close()
+            self._aclient = None
+        if hasattr(self.embedder, "aclose"):
+            await self.embedder.aclose()
+
+    async def _aupsert_batch(
+        self, documents: List[Document], sparse_task: "asyncio.Future", offset: int, wait: bool = False
+    ) -> List[str]:
+        """배치 하나를 dense 임베딩 후 (전체 문서 sparse 결과 중 해당 구간과 함께) upsert"""
+        texts = [doc.page_content for doc in documents]
+        dense_vectors = await self.embedder.aembed_documents(texts)
+        sparse_vectors = (await asyncio.shield(sparse_task))[offset:offset + len(documents)]
+
+        ids = [uuid.uuid4().hex for _ in documents]
+        # 포인트별 PointStruct 대신 열 단위 Batch 1개로 전송
+        points = models.Batch(
+            ids=ids,
+            vectors={
+                "dense": dense_vectors,
+                "sparse": [
+                    models.SparseVector(indices=sparse.indices, values=sparse.values)
+                    for sparse in sparse_vectors
+                ],
+            },
+            payloads=[
+                {
+                    self.vector_store.content_payload_key: doc.page_content,
+                    self.vector_store.metadata_payload_key: doc.metadata,
+                }
+                for doc in documents
+            ],
+        )
+        await self._get_async_client().upsert(
+            collection_name=self.collection_name,
+            points=points,
+            wait=wait,
+        )
+        return ids
+
+    async def aadd_documents(self, documents, batch_size=64, max_concurrency=8, wait=False) -> List[str]:
+        """
+        Langchain Document 리스트를 배치 단위로 동시에 임베딩/적재합니다.
+
+        Args:
+            documents: 추가할 Document 리스트
+            batch_size: 배치당 문서 수
+            max_concurrency: 동시에 처리할 배치 수 (임베딩 provider rate limit 고려)
+            wait: True면 각 배치가 색인될 때까지 기다림 (False면 반환 직후 검색에 새 문서가 빠질 수 있음)
+
+        Returns:
+            추가된 포인트 ID 리스트 (입력 순서 유지)
+        """
+        # sparse(BM25)는 전체 문서를 한 번에 인코딩하고, 그동안 dense 배치 요청을 동시에 진행
+        sparse_task = asyncio.ensure_future(
+            asyncio.to_thread(self.sparse_embedder.embed_documents, [doc.page_content for doc in documents])
+        )
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(offset):
+            async with semaphore:
+                return await self._aupsert_batch(documents[offset:offset + batch_size], sparse_task, offset, wait)
+
+        try:
+            results = await asyncio.gather(*(run(offset) for offset in range(0, len(documents), batch_size)))
+        finally:
+            sparse_task.cancel()
+            # 일부 배치만 적재된 경우에도 이전 검색 결과가 남지 않도록 비움
+            self._clear_semantic_cache()
+        return [point_id for ids in results for point_id in ids]
+
     @timing_step
     def add_documents(self, documents, batch_size=64):
-        """Langchain Document 리스트를 Qdrant에 추가합니다."""
+        """
+        Langchain Document 리스트를 Qdrant에 추가합니다. (aadd_documents를 wait=True로 동기 실행)
+
+        반환 시점에는 모든 문서가 색인되어 바로 검색할 수 있습니다.
+        이벤트 루프 안(FastAPI 핸들러 등)에서는 사용할 수 없으므로 `await aadd_documents(...)`를 사용하세요.
+
+        Returns:
+            추가된 포인트 ID 리스트
+
+        Raises:
+            RuntimeError: 실행 중인 이벤트 루프에서 호출된 경우
+        """
         total = len(documents)
         if not total:
             print("[⚠️] No documents provided to add.")
-            return
+            return []
 
-        print(f"Starting to add {total} documents using Langchain's add_documents...")
         try:
-            ids_returned = self.vector_store.add_documents(documents=documents)
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                "VectorStore.add_documents() cannot run inside a running event loop; "
+                "use 'await VectorStore.aadd_documents(...)' instead."
+            )
+
+        async def run():
+            try:
+                return await self.aadd_documents(documents, batch_size=batch_size, wait=True)
+            finally:
+                # asyncio.run이 끝나면 루프가 닫히므로 루프에 묶인 비동기 클라이언트도 정리
+                await self.aclose()
+
+        print(f"Starting to add {total} documents in batches of {batch_size}...")
+        try:
+            ids_returned = asyncio.run(run())
             print(f"[✅] Successfully added {total} documents. Returned IDs count: {len(ids_returned)}")
+            return ids_returned
 
         except Exception as e:
-            print(f"[❌] Error adding documents via Langchain: {e}")
-            print(traceback.format_exc())
+            logger.exception("add_documents failed: %s", e)
+            raise
+
+    def _get_cached_vectors(self, query: str):
+        """쿼리의 dense/sparse 벡터 반환 (캐시 miss 시에만 임베딩)"""
+        with self._embed_cache_lock:
+            vectors = self._embed_cache.get(query)
+            if vectors is not None:
+                self._embed_cache.move_to_end(query)
+                return vectors
+            future = self._inflight.get(query)
+            owner = future is None
+            if owner:
+                future = self._inflight[query] = Future()
+
+        if not owner:
+            return future.result(timeout=60)
+
+        try:
+            sparse = self.sparse_embedder.embed_query(query)
+            vectors = (
+                self.embedder.embed_query(query),
+                models.SparseVector(indices=sparse.indices, values=sparse.values),
+            )
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self._put_cached_vectors(query, vectors)
+            future.set_result(vectors)
+            return vectors
+        finally:
+            with self._embed_cache_lock:
+                self._inflight.pop(query, None)
+
+    def _get_cached_vectors_many(self, queries: List[str]) -> List[tuple]:
+        """여러 쿼리의 dense/sparse 벡터 반환 (캐시 miss만 모아 배치 임베딩, 순서 유지)"""
+        with self._embed_cache_lock:
+            found = {query: self._embed_cache.get(query) for query in queries}
+        missing = [query for query, vectors in found.items() if vectors is None]
+
+        if missing:
+            dense_vectors = self.embedder.embed_documents(missing)
+            sparse_vectors = self.sparse_embedder.embed_documents(missing)
+            for query, dense, sparse in zip(missing, dense_vectors, sparse_vectors):
+                vectors = (dense, models.SparseVector(indices=sparse.indices, values=sparse.values))
+                found[query] = vectors
+                self._put_cached_vectors(query, vectors)
+
+        return [found[query] for query in queries]
+
+    def _put_cached_vectors(self, query: str, vectors: tuple):
+        """쿼리 벡터 캐시 저장 (최대 개수 초과 시 가장 오래된 항목 제거)"""
+        with self._embed_cache_lock:
+            self._embed_cache[query] = vectors
+            self._embed_cache.move_to_end(query)
+            while len(self._embed_cache) > self._embed_cache_max:
+                self._embed_cache.popitem(last=False)
+
+    @staticmethod
+    def _hybrid_prefetch(dense, sparse, k: int, qdrant_filter: Optional[Filter]) -> List[models.Prefetch]:
+        """dense/sparse 후보 검색 (결합 전 단계, 결합할 후보를 넉넉히 확보)"""
+        limit = k * VectorStore.HYBRID_PREFETCH_FACTOR
+        return [
+            models.Prefetch(
+                query=dense, using="dense", filter=qdrant_filter, limit=limit,
+                params=VectorStore.DENSE_SEARCH_PARAMS,
+            ),
+            models.Prefetch(query=sparse, using="sparse", filter=qdrant_filter, limit=limit),
+        ]
+
+    def _native_hybrid_search(self, dense, sparse, k: int, qdrant_filter: Optional[Filter]):
+        """Qdrant Query API로 prefetch + fusion을 서버에서 한 번에 수행 (ScoredPoint 리스트)"""
+        return self.client.query_points(
+            collection_name=self.collection_name,
+            prefetch=self._hybrid_prefetch(dense, sparse, k, qdrant_filter),
+            query=self.HYBRID_FUSION,
+            query_filter=qdrant_filter,
+            limit=k,
+            with_payload=True,
+            with_vectors=False,
+        ).points
+
+    def _to_documents(self, points) -> List[tuple]:
+        """Qdrant 포인트를 (Document, score) 리스트로 변환 (내부 메타데이터 제외)"""
+        content_key = self.vector_store.content_payload_key
+        metadata_key = self.vector_store.metadata_payload_key
+        return [
+            (
+                Document(
+                    page_content=point.payload.get(content_key, ""),
+                    metadata=self._filter_internal_metadata(point.payload.get(metadata_key)),
+                ),
+                point.score,
+            )
+            for point in points
+        ]
+
+    def _clear_semantic_cache(self):
+        """시맨틱 캐시 비우기 (컬렉션 내용이 바뀌면 캐시된 검색 결과가 더 이상 유효하지 않음)"""
+        with self._sem_cache_lock:
+            self._sem_cache_entries = []
+            self._sem_cache_pos = 0
+
+    @staticmethod
+    def _copy_results(results: List[tuple]) -> List[tuple]:
+        """캐시된 (Document, score) 리스트의 복사본 (호출 측의 metadata 수정이 캐시에 반영되지 않도록)"""
+        return [
+            (Document(page_content=doc.page_content, metadata=dict(doc.metadata)), score)
+            for doc, score in results
+        ]
+
+    def _semantic_cache_get(self, q: np.ndarray, cache_key) -> Optional[List[tuple]]:
+        """정규화 쿼리 벡터와 가장 유사한 과거 쿼리(같은 k/필터)의 결과 반환"""
+        with self._sem_cache_lock:
+            size = len(self._sem_cache_entries)
+            if not size:
+                return None
+            scores = self._sem_cache_vecs[:size] @ q
+            for idx in np.argsort(scores)[::-1]:
+                if scores[idx] < self._sem_cache_threshold:
+                    return None
+                entry_key, results = self._sem_cache_entries[idx]
+                if entry_key == cache_key:
+                    return self._copy_results(results)
+        return None
+
+    def _semantic_cache_put(self, q: np.ndarray, cache_key, results: List[tuple]):
+        """결과 저장 (가득 차면 가장 오래된 항목 자리에 덮어씀)"""
+        with self._sem_cache_lock:
+            if self._sem_cache_vecs is None:
+                self._sem_cache_vecs = np.zeros((self._sem_cache_max, len(q)), dtype=np.float32)
+            pos = self._sem_cache_pos
+            self._sem_cache_vecs[pos] = q
+            if pos < len(self._sem_cache_entries):
+                self._sem_cache_entries[pos] = (cache_key, results)
+            else:
+                self._sem_cache_entries.append((cache_key, results))
+            self._sem_cache_pos = (pos + 1) % self._sem_cache_max
+
+    def _hybrid_query(self, query: str, k: int, qdrant_filter: Optional[Filter]) -> List[tuple]:
+        """dense/sparse prefetch 결과를 RRF로 결합한 하이브리드 검색 (Document, score) 리스트"""
+        dense, sparse = self._get_cached_vectors(query)
+
+        use_sem_cache = self._sem_cache_threshold > 0
+        if use_sem_cache:
+            q = np.asarray(dense, dtype=np.float32)
+            q /= np.linalg.norm(q) or 1.0
+            cache_key = (k, qdrant_filter.model_dump_json() if qdrant_filter else None)
+            cached = self._semantic_cache_get(q, cache_key)
+            if cached is not None:
+                logger.debug("Semantic cache hit query=%.50s", query)
+                return cached
+
+        results = self._to_documents(self._native_hybrid_search(dense, sparse, k, qdrant_filter))
+
+        if use_sem_cache:
+            self._semantic_cache_put(q, cache_key, self._copy_results(results))
+        return results
 
     @timing_step
     def search(self, query: str, k: int = 4, metadata_filter: dict = None):
-        """Langchain VectorStore를 이용한 기본 검색 (메타데이터 필터링 적용)"""
+        """하이브리드 검색 (메타데이터 필터링 적용, 쿼리 임베딩 캐시 사용)"""
         qdrant_filter = create_qdrant_filter(metadata_filter)
         if qdrant_filter:
-            print(f"[🔍] 생성된 필터를 적용합니다: {metadata_filter}")
+            logger.debug("Applying filter: %s", metadata_filter)
 
         try:
-             if not self.vector_store: raise RuntimeError("[❌] Vector store is not initialized.")
-             print(f"[🔍] Performing similarity search for query: '{query[:50]}...' with k={k}")
-             results = self.vector_store.similarity_search(query=query, k=k, filter=qdrant_filter)
-             for doc in results:
-                 doc.metadata = self._filter_internal_metadata(doc.metadata)
-             print(f"[✅] Found {len(results)} results.")
+             logger.debug("Similarity search query=%.50s k=%d", query, k)
+             results = [doc for doc, _ in self._hybrid_query(query, k, qdrant_filter)]
+             logger.debug("Found %d results", len(results))
              return results
         except Exception as e:
-             print(f"[❌] Error during similarity search: {e}")
+             logger.warning("search failed: %s", e)
              return []
 
     @timing_step
     def search_with_score(self, query: str, k: int = 4, metadata_filter: dict = None):
-        """Langchain VectorStore를 이용한 점수 포함 검색"""
+        """하이브리드 검색 (점수 포함, 쿼리 임베딩 캐시 사용)"""
         qdrant_filter = create_qdrant_filter(metadata_filter)
         if qdrant_filter:
-             print(f"[🔍] 생성된 필터를 적용합니다: {metadata_filter}")
+             logger.debug("Applying filter: %s", metadata_filter)
 
         try:
-             if not self.vector_store: raise RuntimeError("[❌] Vector store is not initialized.")
-             print(f"[🔍] Performing similarity search with score for query: '{query[:50]}...' with k={k}")
-             results = self.vector_store.similarity_search_with_score(query=query, k=k, filter=qdrant_filter)
-             for doc, score in results:
-                 doc.metadata = self._filter_internal_metadata(doc.metadata)
-             print(f"[✅] Found {len(results)} results with scores.")
+             logger.debug("Similarity search with score query=%.50s k=%d", query, k)
+             results = self._hybrid_query(query, k, qdrant_filter)
+             logger.debug("Found %d results with scores", len(results))
              return results
         except Exception as e:
-             print(f"[❌] Error during similarity search with score: {e}")
+             logger.warning("search_with_score failed: %s", e)
              return []
+
+    @timing_step
+    def multi_search(self, queries: List[str], k: int = 4, metadata_filter: dict = None):
+        """여러 쿼리를 한 번의 query_batch_points 요청으로 하이브리드 검색 (쿼리별 Document 리스트)"""
+        if not queries:
+            return []
+
+        qdrant_filter = create_qdrant_filter(metadata_filter)
+        if qdrant_filter:
+            logger.debug("Applying filter: %s", metadata_filter)
+
+        try:
+            logger.debug("Batch similarity search queries=%d k=%d", len(queries), k)
+            requests = [
+                models.QueryRequest(
+                    prefetch=self._hybrid_prefetch(dense, sparse, k, qdrant_filter),
+                    query=self.HYBRID_FUSION,
+                    filter=qdrant_filter,
+                    limit=k,
+                    with_payload=True,
+                    with_vector=False,
+                )
+                for dense, sparse in self._get_cached_vectors_many(queries)
+            ]
+            responses = self.client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=requests,
+            )
+            results = [
+                [doc for doc, _ in self._to_documents(response.points)]
+                for response in responses
+            ]
+            logger.debug("Batch search finished for %d queries", len(queries))
+            return results
+        except Exception as e:
+            logger.warning("multi_search failed: %s", e)
+            return [[] for _ in queries]
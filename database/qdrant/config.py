@@ -15,23 +15,64 @@ Pydantic BaseSettings 기반 설정을 사용합니다.
     변경: embedding_config.fastapi_embedding_dims (자동으로 int)
 """
 
-import sys
-from pathlib import Path
+from typing import Dict
 
-# 프로젝트 루트 경로 추가
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+# MemoryConfig 속성 → (config 모듈의 설정 객체 이름, 필드 이름)
+# config 패키지 import(.env 로드 + Pydantic 검증)는 첫 속성 접근 시점까지 지연됩니다.
+_MEMORY_CONFIG_FIELDS = {
+    # Qdrant 설정 (qdrant_config에서 가져옴)
+    "QDRANT_URL": ("qdrant_config", "qdrant_url"),
+    "QDRANT_PASSWORD": ("qdrant_config", "qdrant_password"),
+    "MANAGER_M_COLLECTION": ("qdrant_config", "manager_m_collection"),
+    "QDRANT_PREFER_GRPC": ("qdrant_config", "qdrant_prefer_grpc"),
+    "QDRANT_GRPC_PORT": ("qdrant_config", "qdrant_grpc_port"),
+    "QDRANT_POOL_SIZE": ("qdrant_config", "qdrant_pool_size"),
+    "PAYLOAD_INDEX_FIELDS": ("qdrant_config", "payload_index_fields"),
+    # 임베딩 설정 (embedding_config에서 가져옴)
+    "EMBEDDING_TYPE": ("embedding_config", "embedding_type"),
+    "EMBEDDER_URL": ("embedding_config", "embedder_url"),
+    "FASTAPI_EMBEDDING_DIMS": ("embedding_config", "fastapi_embedding_dims"),
+    "OPENAI_EMBEDDING_DIMS": ("embedding_config", "openai_embedding_dims"),
+    "SEMANTIC_CACHE_THRESHOLD": ("embedding_config", "semantic_cache_threshold"),
+    "WARMUP_SPARSE": ("embedding_config", "warmup_sparse"),
+    # OpenAI API Key (api_config에서 가져옴)
+    "OPENAI_API_KEY": ("api_config", "openai_api_key"),
+}
+
+_LAZY_EXPORTS = ("qdrant_config", "embedding_config", "api_config")
+
+
+def __getattr__(name: str):
+    """qdrant_config / embedding_config / api_config 지연 import"""
+    if name in _LAZY_EXPORTS:
+        import config
+        return getattr(config, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _MemoryConfigMeta(type):
+    """클래스 속성 접근 시 설정값을 읽어 클래스에 캐싱하는 메타클래스"""
 
-# Pydantic 기반 설정 import
-from config import qdrant_config, embedding_config, api_config
+    def __getattr__(cls, name: str):
+        try:
+            config_name, field_name = _MEMORY_CONFIG_FIELDS[name]
+        except KeyError:
+            raise AttributeError(f"type object {cls.__name__!r} has no attribute {name!r}") from None
 
+        import config
+        value = getattr(getattr(config, config_name), field_name)
+        setattr(cls, name, value)  # 이후 접근은 일반 클래스 속성 조회
+        return value
 
-class MemoryConfig:
+
+class MemoryConfig(metaclass=_MemoryConfigMeta):
     """
     메모리 설정 클래스 (하위 호환성을 위해 유지)
 
     ⚠️ DEPRECATED: 새로운 코드에서는 qdrant_config와 embedding_config를 직접 사용하세요.
 
+    속성(QDRANT_URL, EMBEDDING_TYPE 등)은 첫 접근 시 config에서 읽어 캐싱합니다.
+
     예시:
         # 기존 방식 (deprecated)
         url = MemoryConfig.QDRANT_URL
@@ -40,19 +81,20 @@ class MemoryConfig:
         url = qdrant_config.qdrant_url
     """
 
-    # Qdrant 설정 (qdrant_config에서 가져옴)
-    QDRANT_URL: str = qdrant_config.qdrant_url
-    QDRANT_PASSWORD: str = qdrant_config.qdrant_password
-    MANAGER_M_COLLECTION: str = qdrant_config.manager_m_collection
-
-    # 임베딩 설정 (embedding_config에서 가져옴)
-    EMBEDDING_TYPE: str = embedding_config.embedding_type
-    EMBEDDER_URL: str = embedding_config.embedder_url
-    FASTAPI_EMBEDDING_DIMS: int = embedding_config.fastapi_embedding_dims
-    OPENAI_EMBEDDING_DIMS: int = embedding_config.openai_embedding_dims
-
-    # OpenAI API Key (api_config에서 가져옴)
-    OPENAI_API_KEY: str = api_config.openai_api_key
+    QDRANT_URL: str
+    QDRANT_PASSWORD: str
+    MANAGER_M_COLLECTION: str
+    QDRANT_PREFER_GRPC: bool
+    QDRANT_GRPC_PORT: int
+    QDRANT_POOL_SIZE: int
+    PAYLOAD_INDEX_FIELDS: Dict[str, str]
+    EMBEDDING_TYPE: str
+    EMBEDDER_URL: str
+    FASTAPI_EMBEDDING_DIMS: int
+    OPENAI_EMBEDDING_DIMS: int
+    SEMANTIC_CACHE_THRESHOLD: float
+    WARMUP_SPARSE: bool
+    OPENAI_API_KEY: str
 
     @classmethod
     def validate(cls) -> bool:
@@ -75,6 +117,7 @@ class MemoryConfig:
         print(f"QDRANT_URL: {cls.QDRANT_URL}")
         print(f"QDRANT_PASSWORD: {'*' * len(cls.QDRANT_PASSWORD)}")
         print(f"MANAGER_M_COLLECTION: {cls.MANAGER_M_COLLECTION}")
+        print(f"QDRANT_PREFER_GRPC: {cls.QDRANT_PREFER_GRPC}")
         print(f"EMBEDDING_TYPE: {cls.EMBEDDING_TYPE}")
         if cls.EMBEDDING_TYPE == "fastapi":
             print(f"EMBEDDER_URL: {cls.EMBEDDER_URL}")
@@ -93,7 +136,7 @@ __all__ = [
 ]
 
 
-# 모듈 로드 시 검증
+# 설정 확인 (프로젝트 루트에서 `python -m database.qdrant.config`로 실행)
 if __name__ == "__main__":
     MemoryConfig.print_config()
     if MemoryConfig.validate():
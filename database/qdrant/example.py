@@ -74,7 +74,7 @@ def example_openai():
         recreate_collection=True,
         embedding_type="openai",  # OpenAI 명시
         # openai_api_key는 .env에서 자동 로드됨
-        # dense_size=3072 (자동 설정됨)
+        # dense_size=1024 (자동 설정됨)
     )
 
     # 문서 생성
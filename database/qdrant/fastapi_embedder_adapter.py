@@ -1,76 +1,243 @@
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 from langchain.embeddings.base import Embeddings
-import requests
-import time
-from typing import List
+import httpx
+import logging
+from tenacity import (
+    AsyncRetrying,
+    Retrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+import threading
+from typing import Dict, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
 
 class FastAPIEmbedderAdapter(Embeddings):
     """FastAPI 임베딩 서버와 통신하는 어댑터"""
-    
-    def __init__(self, base_url="http://localhost:8000", retry_attempts=3, retry_delay=2, timeout=60):
+
+    # 이 프로세스에서 /health 확인을 마친 서버 URL (인스턴스를 다시 만들 때 재확인 생략)
+    _verified_urls: Set[str] = set()
+
+    def __init__(self, base_url="http://localhost:8000", retry_attempts=3, retry_delay=2, timeout=60,
+                 batch_size=64, max_concurrency=8, cache_size=10_000):
         self.base_url = base_url.rstrip('/')
         self.retry_attempts = retry_attempts
         self.retry_delay = retry_delay
         self.timeout = timeout
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+
+        # 동일 텍스트 재임베딩 방지용 LRU 캐시 (병렬 청크 요청과 공유하므로 lock 사용)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # 요청마다 TCP/TLS 연결을 새로 맺지 않도록 keep-alive 연결 풀 재사용
+        # (embed_documents의 청크 스레드들이 함께 사용하므로 thread-safe한 httpx.Client)
+        self._client = httpx.Client(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=16),
+        )
+
+        # 비동기 클라이언트는 이벤트 루프 안에서 처음 사용할 때 생성
+        self._aclient: httpx.AsyncClient = None
+
+        # 재시도 정책은 인스턴스 설정으로 한 번만 구성하고 호출마다 copy()해서 사용
+        self._sync_retrying = Retrying(**self._retry_kwargs(httpx.HTTPError))
+        self._async_retrying = AsyncRetrying(**self._retry_kwargs(httpx.HTTPError))
+
         self._verify_connection()
 
     def _verify_connection(self):
-        """서버 연결 확인"""
-        print(f"[🔗] Connecting to FastAPI server at {self.base_url}...")
+        """서버 연결 확인 (URL당 프로세스에서 한 번만)"""
+        if self.base_url in FastAPIEmbedderAdapter._verified_urls:
+            return
+        logger.debug("Connecting to FastAPI server at %s...", self.base_url)
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
+            response = self._client.get("/health", timeout=5)
             response.raise_for_status()
-            print("[✅] FastAPI connection successful.")
+            FastAPIEmbedderAdapter._verified_urls.add(self.base_url)
+            logger.debug("FastAPI connection successful.")
         except Exception as e:
-            print(f"[❌] Failed to connect to FastAPI server: {e}")
+            logger.error("Failed to connect to FastAPI server: %s", e)
             raise
 
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """HTTP/2 비동기 클라이언트 (인스턴스당 1개 재사용)"""
+        if self._aclient is None or self._aclient.is_closed:
+            self._aclient = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=True,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            )
+        return self._aclient
+
+    async def __aenter__(self):
+        self._get_async_client()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """비동기 클라이언트 종료"""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+
+    def _retry_kwargs(self, exception_types) -> dict:
+        """sync/async 재시도 공통 정책 (retry_delay부터 지수 증가 + jitter 대기)"""
+        def log_retry(retry_state):
+            logger.warning(
+                "FastAPI request failed (%s). Retrying %d/%d...",
+                retry_state.outcome.exception(), retry_state.attempt_number, self.retry_attempts,
+            )
+
+        return dict(
+            stop=stop_after_attempt(self.retry_attempts),
+            wait=wait_exponential_jitter(initial=self.retry_delay),
+            retry=retry_if_exception_type(exception_types),
+            before_sleep=log_retry,
+            reraise=True,
+        )
+
     @staticmethod
     def _retry(func):
         """재시도 데코레이터"""
         @wraps(func)
         def wrapper(self, *args, **kwargs):
-            attempts = 0
-            last_exception = None
-            
-            while attempts < self.retry_attempts:
-                try:
-                    return func(self, *args, **kwargs)
-                except requests.exceptions.RequestException as e:
-                    attempts += 1
-                    last_exception = e
-                    print(f"[⚡] FastAPI request failed ({e}). Retrying {attempts}/{self.retry_attempts}...")
-                    
-                    if attempts < self.retry_attempts:
-                        time.sleep(self.retry_delay * attempts)
-                    else:
-                        print(f"[❌] FastAPI server request failed after {self.retry_attempts} attempts.")
-                        raise Exception(f"FastAPI server operation failed: {last_exception}")
-                except Exception as e:
-                    print(f"[❌] Unexpected error during FastAPI call: {e}")
-                    raise
-                    
-            raise Exception(f"Failed after {self.retry_attempts} retries: {last_exception}")
+            return self._sync_retrying.copy()(func, self, *args, **kwargs)
         return wrapper
 
-    @_retry
+    @staticmethod
+    def _aretry(func):
+        """비동기 재시도 데코레이터"""
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            return await self._async_retrying.copy()(func, self, *args, **kwargs)
+        return wrapper
+
+    def _cache_get(self, text: str):
+        """캐시 조회 (hit 시 최근 사용으로 갱신)"""
+        with self._cache_lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+            return vector
+
+    def _cache_put(self, text: str, vector: List[float]):
+        """캐시 저장 (cache_size 초과 시 가장 오래된 항목 제거)"""
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[text] = vector
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _split_cached(self, texts: List[str]) -> Tuple[Dict[str, List[float]], List[str]]:
+        """중복 제거 후 (캐시 hit 결과, 캐시 miss 텍스트 리스트) 반환"""
+        found = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            vector = self._cache_get(text)
+            if vector is None:
+                missing.append(text)
+            else:
+                found[text] = vector
+        return found, missing
+
+    def _chunk(self, texts: List[str]) -> List[List[str]]:
+        """batch_size 단위로 분할"""
+        return [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+    def _merge_results(self, texts, found, missing, results) -> List[List[float]]:
+        """청크 결과를 캐시에 저장하고 입력 순서대로 재배열"""
+        vectors = [vector for chunk in results for vector in chunk]
+        for text, vector in zip(missing, vectors):
+            found[text] = vector
+            self._cache_put(text, vector)
+        return [found[text] for text in texts]
+
     def embed_query(self, text: str) -> List[float]:
-        """단일 텍스트 임베딩"""
-        response = requests.post(
-            f"{self.base_url}/embed",
-            json={"text": text},
-            timeout=self.timeout
-        )
+        """단일 텍스트 임베딩 (캐시 우선)"""
+        vector = self._cache_get(text)
+        if vector is None:
+            vector = self._embed_one(text)
+            self._cache_put(text, vector)
+        return vector
+
+    @_retry
+    def _embed_one(self, text: str) -> List[float]:
+        """단일 텍스트 임베딩 요청"""
+        response = self._client.post("/embed", json={"text": text})
         response.raise_for_status()
         return response.json()["embedding"]
 
     @_retry
+    def _embed_chunk(self, texts: List[str]) -> List[List[float]]:
+        """텍스트 청크 하나를 배치 임베딩"""
+        response = self._client.post("/embed_documents", json={"texts": texts})
+        response.raise_for_status()
+        return response.json()["embeddings"]
+
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """여러 텍스트 배치 임베딩"""
-        response = requests.post(
-            f"{self.base_url}/embed_documents",
-            json={"texts": texts},
-            timeout=self.timeout
-        )
+        """여러 텍스트 배치 임베딩 (중복 제거 + 캐시 미스만 batch_size 단위 병렬 요청, 순서 유지)"""
+        found, missing = self._split_cached(texts)
+
+        results = []
+        if missing:
+            chunks = self._chunk(missing)
+            if len(chunks) == 1:
+                results = [self._embed_chunk(chunks[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(chunks))) as executor:
+                    results = list(executor.map(self._embed_chunk, chunks))
+
+        return self._merge_results(texts, found, missing, results)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """단일 텍스트 임베딩 (비동기, 캐시 우선)"""
+        vector = self._cache_get(text)
+        if vector is None:
+            vector = await self._aembed_one(text)
+            self._cache_put(text, vector)
+        return vector
+
+    @_aretry
+    async def _aembed_one(self, text: str) -> List[float]:
+        """단일 텍스트 임베딩 요청 (비동기)"""
+        response = await self._get_async_client().post("/embed", json={"text": text})
+        response.raise_for_status()
+        return response.json()["embedding"]
+
+    @_aretry
+    async def _aembed_chunk(self, texts: List[str]) -> List[List[float]]:
+        """텍스트 청크 하나를 배치 임베딩 (비동기)"""
+        response = await self._get_async_client().post("/embed_documents", json={"texts": texts})
         response.raise_for_status()
         return response.json()["embeddings"]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """여러 텍스트 배치 임베딩 (비동기, 청크를 max_concurrency 만큼 동시 요청)"""
+        found, missing = self._split_cached(texts)
+
+        results = []
+        if missing:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def run(chunk):
+                async with semaphore:
+                    return await self._aembed_chunk(chunk)
+
+            results = await asyncio.gather(*(run(chunk) for chunk in self._chunk(missing)))
+
+        return self._merge_results(texts, found, missing, results)
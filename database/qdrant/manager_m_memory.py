@@ -10,28 +10,129 @@ Manager M은 목표 외의 모든 일반적인 기억을 관리합니다.
 기존 FastAPIEmbedderAdapter를 재사용합니다.
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Iterator, Optional, Any, Union
 from datetime import datetime
-import uuid
+from functools import lru_cache
+from itertools import islice
+import logging
+import secrets
+import time
 import os
 from pathlib import Path
 from qdrant_client import QdrantClient
+from qdrant_client.http.exceptions import UnexpectedResponse
 from qdrant_client.models import (
     Distance,
     VectorParams,
     PointStruct,
+    Batch,
+    PointVectors,
+    ScoredPoint,
     Filter,
     FieldCondition,
     MatchValue,
+    QueryRequest,
+    PayloadSchemaType,
+    OrderBy,
+    Direction,
+    KeywordIndexParams,
+    KeywordIndexType,
+    HnswConfigDiff,
+    OptimizersConfigDiff,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    QuantizationSearchParams,
+    PayloadSelectorInclude,
 )
 from database.qdrant.fastapi_embedder_adapter import FastAPIEmbedderAdapter
 from database.qdrant.openai_embedder_adapter import OpenAIEmbedderAdapter
 from database.qdrant.config import MemoryConfig
 
+logger = logging.getLogger(__name__)
+
+
+def _timestamps() -> tuple[str, int]:
+    """현재 시각을 (표시용 ISO 문자열, 정렬용 나노초 epoch 정수)로 반환"""
+    now_ns = time.time_ns()
+    return datetime.fromtimestamp(now_ns / 1e9).isoformat(), now_ns
+
+
+def _new_point_id() -> int:
+    """새 포인트 ID (63비트 난수 정수, Qdrant의 unsigned integer ID로 저장)"""
+    return secrets.randbits(63)
+
+
+def _point_id(memory_id: Union[int, str]) -> Union[int, str]:
+    """
+    외부에서 받은 기억 ID를 Qdrant 포인트 ID로 변환
+
+    에이전트/API를 거치면 정수 ID도 문자열로 들어오므로 숫자 문자열은 정수로 바꾸고,
+    이전에 저장된 UUID 문자열은 그대로 사용합니다.
+    """
+    if isinstance(memory_id, str) and memory_id.isdigit():
+        return int(memory_id)
+    return memory_id
+
+
+def _is_not_found(error: Exception) -> bool:
+    """Qdrant의 '포인트 없음' 오류인지 확인 (REST 404 / gRPC NOT_FOUND)"""
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 404
+    # gRPC 전송은 grpc.RpcError (status code의 name으로 비교해 grpc를 직접 import하지 않음)
+    code = getattr(error, "code", None)
+    return callable(code) and getattr(code(), "name", None) == "NOT_FOUND"
+
+
+@lru_cache(maxsize=4096)
+def _compile_filter(user_id: str, memory_type: Optional[str] = None) -> Filter:
+    """
+    user_id (+ memory_type) 필터 구성
+
+    같은 조합은 캐시된 Filter 객체를 재사용합니다 (호출부에서 수정하지 않으므로 공유해도 안전).
+    """
+    must_conditions = [
+        FieldCondition(
+            key="user_id",
+            match=MatchValue(value=user_id),
+        )
+    ]
+
+    if memory_type:
+        must_conditions.append(
+            FieldCondition(
+                key="memory_type",
+                match=MatchValue(value=memory_type),
+            )
+        )
+
+    return Filter(must=must_conditions)
+
 
 class ManagerMMemory:
     """Manager M을 위한 메모리 관리 클래스"""
 
+    # 필터/정렬에 사용하는 payload 필드 인덱스
+    # user_id: 모든 조회가 사용자 단위이므로 tenant 인덱스로 지정 (사용자별 HNSW 그래프 구성)
+    # created_at_ns: created_at(ISO 문자열)과 함께 저장하는 나노초 epoch 정수 (order_by 정렬용)
+    PAYLOAD_INDEXES = {
+        "user_id": KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True),
+        "memory_type": PayloadSchemaType.KEYWORD,
+        "created_at_ns": PayloadSchemaType.INTEGER,
+    }
+
+    # INT8 양자화 벡터로 후보를 넉넉히(2배) 찾은 뒤 원본 벡터로 재채점하여 recall 유지
+    SEARCH_PARAMS = SearchParams(
+        quantization=QuantizationSearchParams(rescore=True, oversampling=2.0),
+    )
+
+    # 컨텍스트 요약/히스토리 조회 시 가져올 payload 키 (벡터와 사용자 메타데이터는 제외)
+    SUMMARY_PAYLOAD = PayloadSelectorInclude(include=["content", "memory_type", "created_at"])
+    HISTORY_PAYLOAD = PayloadSelectorInclude(
+        include=["content", "memory_type", "user_id", "created_at", "updated_at"]
+    )
+
     def __init__(
         self,
         embedding_type: Optional[str] = None,
@@ -41,6 +142,8 @@ class ManagerMMemory:
         qdrant_api_key: Optional[str] = None,
         collection_name: Optional[str] = None,
         embedding_dims: Optional[int] = None,
+        prefer_grpc: Optional[bool] = None,
+        dedup_threshold: Optional[float] = None,
     ):
         """
         Manager M 메모리 초기화
@@ -53,12 +156,17 @@ class ManagerMMemory:
             qdrant_api_key: Qdrant API 키 (기본값: config에서 로드)
             collection_name: Qdrant 컬렉션 이름 (기본값: config에서 로드)
             embedding_dims: 임베딩 차원 (기본값: config에서 로드)
+            prefer_grpc: Qdrant gRPC 전송 사용 여부 (기본값: config에서 로드)
+            dedup_threshold: add_memory 시 이 코사인 유사도 이상인 기존 기억이 있으면 새로 추가하지 않고
+                             기존 기억을 그대로 반환 (기본값 None: 중복 검사 비활성화)
         """
         # config에서 기본값 로드
         embedding_type = embedding_type or MemoryConfig.EMBEDDING_TYPE
         qdrant_url = qdrant_url or MemoryConfig.QDRANT_URL
         qdrant_api_key = qdrant_api_key or MemoryConfig.QDRANT_PASSWORD
         collection_name = collection_name or MemoryConfig.MANAGER_M_COLLECTION
+        if prefer_grpc is None:
+            prefer_grpc = MemoryConfig.QDRANT_PREFER_GRPC
 
         # 설정 검증
         if not MemoryConfig.validate():
@@ -66,13 +174,14 @@ class ManagerMMemory:
 
         self.collection_name = collection_name
         self.embedding_type = embedding_type
+        self.dedup_threshold = dedup_threshold
 
         # 임베딩 타입에 따라 embedder 초기화
         if embedding_type == "fastapi":
             embedder_url = embedder_url or MemoryConfig.EMBEDDER_URL
             embedding_dims = embedding_dims or MemoryConfig.FASTAPI_EMBEDDING_DIMS
 
-            print(f"[🔗] Initializing FastAPI Embedder: {embedder_url}")
+            logger.info("Initializing FastAPI Embedder: %s", embedder_url)
             self.embedder = FastAPIEmbedderAdapter(
                 base_url=embedder_url,
                 retry_attempts=3,
@@ -85,7 +194,7 @@ class ManagerMMemory:
             openai_api_key = openai_api_key or MemoryConfig.OPENAI_API_KEY
             embedding_dims = embedding_dims or MemoryConfig.OPENAI_EMBEDDING_DIMS
 
-            print(f"[🔗] Initializing OpenAI Embedder: text-embedding-3-large")
+            logger.info("Initializing OpenAI Embedder: text-embedding-3-large")
             self.embedder = OpenAIEmbedderAdapter(
                 api_key=openai_api_key,
                 dimensions=embedding_dims,
@@ -96,20 +205,30 @@ class ManagerMMemory:
             raise ValueError(f"Invalid embedding_type: {embedding_type}. Must be 'fastapi' or 'openai'.")
 
         # Qdrant 클라이언트 초기화
-        print(f"[🔗] Connecting to Qdrant: {qdrant_url}")
+        logger.info("Connecting to Qdrant: %s", qdrant_url)
         client_args = {'url': qdrant_url, 'timeout': 60}
         if qdrant_api_key:
             client_args['api_key'] = qdrant_api_key
+        if prefer_grpc:
+            # gRPC 채널은 하나의 HTTP/2 연결을 유지하며 요청을 다중화 (keepalive로 유휴 연결 유지)
+            client_args.update(
+                prefer_grpc=True,
+                grpc_port=MemoryConfig.QDRANT_GRPC_PORT,
+                grpc_options={"grpc.keepalive_time_ms": 30000},
+            )
+        else:
+            # REST 연결 풀 크기 (기본 풀보다 크게 잡아 동시 요청 시 연결 재생성 방지)
+            client_args['pool_size'] = MemoryConfig.QDRANT_POOL_SIZE
         self.client = QdrantClient(**client_args)
 
         # 컬렉션 생성 또는 확인
         self._ensure_collection()
 
-        print(f"[✅] Manager M Memory initialized")
-        print(f"    - Collection: {self.collection_name}")
-        print(f"    - Qdrant: {qdrant_url}")
-        print(f"    - Embedding Type: {self.embedding_type}")
-        print(f"    - Embedding Dims: {self.embedding_dims}")
+        logger.info(
+            "Manager M Memory initialized (collection=%s, qdrant=%s %s, embedding=%s, dims=%d)",
+            self.collection_name, qdrant_url, "gRPC" if prefer_grpc else "REST",
+            self.embedding_type, self.embedding_dims,
+        )
 
     def _ensure_collection(self):
         """컬렉션이 존재하지 않으면 생성"""
@@ -118,21 +237,74 @@ class ManagerMMemory:
             collection_names = [col.name for col in collections]
 
             if self.collection_name not in collection_names:
-                print(f"[📦] Creating collection: {self.collection_name}")
+                logger.info("Creating collection: %s", self.collection_name)
                 self.client.create_collection(
                     collection_name=self.collection_name,
+                    # 원본 float32 벡터는 디스크에 두고, INT8 양자화 벡터(1/4 크기)만 RAM에 유지
                     vectors_config=VectorParams(
                         size=self.embedding_dims,
                         distance=Distance.COSINE,
+                        on_disk=True,
+                    ),
+                    quantization_config=ScalarQuantization(
+                        scalar=ScalarQuantizationConfig(
+                            type=ScalarType.INT8,
+                            quantile=0.99,
+                            always_ram=True,
+                        ),
                     ),
+                    # 전역 HNSW 그래프 대신 user_id별 그래프만 구성 (검색은 항상 user_id 필터 포함)
+                    hnsw_config=HnswConfigDiff(payload_m=16, m=0),
+                    # 세그먼트 수를 적게 유지해 삭제된 포인트가 최적화(병합) 시 빨리 정리되도록 함
+                    optimizers_config=OptimizersConfigDiff(default_segment_number=2),
                 )
-                print(f"[✅] Collection created: {self.collection_name}")
+                logger.info("Collection created: %s", self.collection_name)
             else:
-                print(f"[✅] Collection already exists: {self.collection_name}")
+                logger.debug("Collection already exists: %s", self.collection_name)
+                self._match_existing_dims()
+
+            self._ensure_payload_indexes()
         except Exception as e:
-            print(f"[❌] Failed to ensure collection: {e}")
+            logger.error("Failed to ensure collection: %s", e)
             raise
 
+    def _match_existing_dims(self):
+        """
+        기존 컬렉션의 벡터 차원과 설정 차원이 다를 때 처리
+
+        OpenAI 임베더는 dimensions 파라미터로 임의 차원을 받을 수 있으므로
+        기존 컬렉션(예: 이전 기본값 3072) 차원에 맞춰 계속 사용합니다.
+        새 차원으로 옮기려면 새 컬렉션 이름으로 재적재하세요.
+        """
+        existing_dims = self.client.get_collection(self.collection_name).config.params.vectors.size
+        if existing_dims == self.embedding_dims:
+            return
+
+        if self.embedding_type == "openai":
+            logger.warning(
+                "Collection '%s' uses %d dims (configured: %d). Using %d dims for this collection.",
+                self.collection_name, existing_dims, self.embedding_dims, existing_dims,
+            )
+            self.embedder.dimensions = existing_dims
+            self.embedding_dims = existing_dims
+        else:
+            raise ValueError(
+                f"Collection '{self.collection_name}' uses {existing_dims} dims, "
+                f"but the {self.embedding_type} embedder produces {self.embedding_dims} dims."
+            )
+
+    def _ensure_payload_indexes(self):
+        """PAYLOAD_INDEXES 중 아직 없는 payload 인덱스 생성"""
+        existing = self.client.get_collection(self.collection_name).payload_schema or {}
+        for field_name, field_schema in self.PAYLOAD_INDEXES.items():
+            if field_name not in existing:
+                logger.info("Creating payload index: %s (%s)", field_name, field_schema)
+                self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema,
+                )
+
     def add_memory(
         self,
         content: str,
@@ -149,23 +321,44 @@ class ManagerMMemory:
             memory_type: 기억 유형 (general, preference, habit, interaction 등)
             metadata: 추가 메타데이터
 
+        Note: dedup_threshold가 설정되어 있으면 같은 사용자/유형에서 그 이상 유사한 기존 기억이
+              있을 때 아무것도 저장하지 않고 기존 기억을 그대로 반환합니다 (덮어쓰지 않음,
+              내용 변경은 승인이 필요한 update_memory로만 가능).
+              이 경우 반환값의 id/content/metadata는 기존 기억의 값이고 deduplicated가 True입니다.
+
         Returns:
-            추가된 기억 정보 (memory_id 포함)
+            기억 정보 (id, content, user_id, memory_type, 전체 metadata, deduplicated)
         """
         try:
             # 임베딩 생성
             embedding = self.embedder.embed_query(content)
 
+            # 거의 같은 기억이 이미 있으면 새로 추가하지 않고 기존 기억을 그대로 반환
+            duplicate = self._find_duplicate(embedding, user_id, memory_type)
+            if duplicate is not None:
+                logger.debug("Near-duplicate memory exists user=%s preview=%.50s", user_id, content)
+                return {
+                    "id": duplicate.id,
+                    "content": duplicate.payload.get("content", ""),
+                    "user_id": user_id,
+                    "memory_type": memory_type,
+                    "metadata": duplicate.payload,
+                    "deduplicated": True,
+                }
+
             # 메모리 ID 생성
-            memory_id = str(uuid.uuid4())
+            memory_id = _new_point_id()
 
             # 메타데이터 구성
+            now_iso, now_ns = _timestamps()
             full_metadata = {
                 "content": content,
                 "user_id": user_id,
                 "memory_type": memory_type,
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now_iso,
+                "created_at_ns": now_ns,
+                "updated_at": now_iso,
+                "updated_at_ns": now_ns,
                 **(metadata or {})
             }
 
@@ -181,16 +374,104 @@ class ManagerMMemory:
                 ],
             )
 
-            print(f"[✅] Memory added for user '{user_id}': {content[:50]}...")
+            logger.debug("Memory added user=%s preview=%.50s", user_id, content)
             return {
                 "id": memory_id,
                 "content": content,
                 "user_id": user_id,
                 "memory_type": memory_type,
                 "metadata": full_metadata,
+                "deduplicated": False,
             }
         except Exception as e:
-            print(f"[❌] Failed to add memory: {e}")
+            logger.error("Failed to add memory: %s", e)
+            raise
+
+    def _find_duplicate(
+        self,
+        embedding: List[float],
+        user_id: str,
+        memory_type: str
+    ) -> Optional[ScoredPoint]:
+        """같은 사용자/유형에서 dedup_threshold 이상 유사한 기억 (payload 포함, 없으면 None)"""
+        if self.dedup_threshold is None:
+            return None
+
+        points = self.client.query_points(
+            collection_name=self.collection_name,
+            query=embedding,
+            query_filter=_compile_filter(user_id, memory_type),
+            limit=1,
+            score_threshold=self.dedup_threshold,
+            search_params=self.SEARCH_PARAMS,
+            with_payload=True,
+            with_vectors=False,
+        ).points
+        return points[0] if points else None
+
+    def add_memories(
+        self,
+        items: List[Dict[str, Any]],
+        user_id: str,
+        wait: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 기억을 한 번에 추가 (임베딩 1회 배치 호출 + upsert 1회)
+
+        Args:
+            items: 추가할 기억 리스트
+                   각 항목: {"content": str, "memory_type": str (옵션), "metadata": dict (옵션)}
+            user_id: 사용자 ID
+            wait: False면 Qdrant 반영 완료를 기다리지 않고 반환 (대량 적재 처리량 우선)
+
+        Returns:
+            추가된 기억 정보 리스트 (add_memory와 동일한 형식, 입력 순서 유지)
+        """
+        if not items:
+            return []
+
+        try:
+            # 임베딩 일괄 생성
+            embeddings = self.embedder.embed_documents([item["content"] for item in items])
+
+            now_iso, now_ns = _timestamps()
+            ids = []
+            payloads = []
+            added = []
+            for item, embedding in zip(items, embeddings):
+                memory_id = _new_point_id()
+                memory_type = item.get("memory_type", "general")
+                full_metadata = {
+                    "content": item["content"],
+                    "user_id": user_id,
+                    "memory_type": memory_type,
+                    "created_at": now_iso,
+                    "created_at_ns": now_ns,
+                    "updated_at": now_iso,
+                    "updated_at_ns": now_ns,
+                    **(item.get("metadata") or {})
+                }
+                ids.append(memory_id)
+                payloads.append(full_metadata)
+                added.append({
+                    "id": memory_id,
+                    "content": item["content"],
+                    "user_id": user_id,
+                    "memory_type": memory_type,
+                    "metadata": full_metadata,
+                })
+
+            # Qdrant에 일괄 저장 (포인트별 PointStruct 검증 없이 열 단위 Batch 1개로 전송)
+            self.client.upsert(
+                collection_name=self.collection_name,
+                points=Batch(ids=ids, vectors=embeddings, payloads=payloads),
+                wait=wait,
+            )
+
+            logger.debug("%d memories added user=%s", len(added), user_id)
+            return added
+        except Exception as e:
+            logger.error("Failed to add memories: %s", e)
             raise
 
     def search_memories(
@@ -217,30 +498,18 @@ class ManagerMMemory:
             query_embedding = self.embedder.embed_query(query)
 
             # 필터 구성
-            must_conditions = [
-                FieldCondition(
-                    key="user_id",
-                    match=MatchValue(value=user_id),
-                )
-            ]
-
-            if memory_type:
-                must_conditions.append(
-                    FieldCondition(
-                        key="memory_type",
-                        match=MatchValue(value=memory_type),
-                    )
-                )
-
-            query_filter = Filter(must=must_conditions) if must_conditions else None
+            query_filter = _compile_filter(user_id, memory_type)
 
             # Qdrant 검색
-            search_results = self.client.search(
+            search_results = self.client.query_points(
                 collection_name=self.collection_name,
-                query_vector=query_embedding,
+                query=query_embedding,
                 query_filter=query_filter,
                 limit=limit,
-            )
+                search_params=self.SEARCH_PARAMS,
+                with_payload=True,
+                with_vectors=False,
+            ).points
 
             # 결과 포맷팅
             memories = []
@@ -253,74 +522,140 @@ class ManagerMMemory:
                     "metadata": result.payload,
                 })
 
-            print(f"[🔍] Found {len(memories)} memories for query: '{query[:50]}...'")
+            logger.debug("Found %d memories query=%.50s", len(memories), query)
             return memories
         except Exception as e:
-            print(f"[❌] Failed to search memories: {e}")
+            logger.error("Failed to search memories: %s", e)
             raise
 
-    def get_all_memories(
+    def search_memories_batch(
         self,
+        queries: List[str],
         user_id: str,
-        memory_type: Optional[str] = None,
-        limit: int = 100
-    ) -> List[Dict[str, Any]]:
+        limit: int = 5,
+        memory_type: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
         """
-        사용자의 모든 기억 조회
+        여러 쿼리로 관련 기억 일괄 검색 (임베딩 1회 배치 호출 + query_batch_points 1회)
 
         Args:
+            queries: 검색 쿼리 리스트
             user_id: 사용자 ID
+            limit: 쿼리당 최대 결과 개수
             memory_type: 기억 유형 필터 (옵션)
-            limit: 최대 반환 개수 (기본값: 100)
 
         Returns:
-            모든 기억 리스트
+            쿼리별 기억 리스트 (queries와 같은 순서, 각 항목은 search_memories와 동일한 형식)
         """
+        if not queries:
+            return []
+
         try:
-            # 필터 구성
-            must_conditions = [
-                FieldCondition(
-                    key="user_id",
-                    match=MatchValue(value=user_id),
-                )
-            ]
+            query_embeddings = self.embedder.embed_documents(queries)
+            query_filter = _compile_filter(user_id, memory_type)
 
-            if memory_type:
-                must_conditions.append(
-                    FieldCondition(
-                        key="memory_type",
-                        match=MatchValue(value=memory_type),
+            batch_results = self.client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=[
+                    QueryRequest(
+                        query=embedding,
+                        filter=query_filter,
+                        limit=limit,
+                        params=self.SEARCH_PARAMS,
+                        with_payload=True,
+                        with_vector=False,
                     )
-                )
+                    for embedding in query_embeddings
+                ],
+            )
+
+            all_memories = [
+                [
+                    {
+                        "id": result.id,
+                        "content": result.payload.get("content", ""),
+                        "type": result.payload.get("memory_type", "unknown"),
+                        "score": result.score,
+                        "metadata": result.payload,
+                    }
+                    for result in response.points
+                ]
+                for response in batch_results
+            ]
+
+            logger.debug("Batch search finished for %d queries", len(queries))
+            return all_memories
+        except Exception as e:
+            logger.error("Failed to batch search memories: %s", e)
+            raise
 
-            query_filter = Filter(must=must_conditions)
+    def iter_all_memories(
+        self,
+        user_id: str,
+        memory_type: Optional[str] = None,
+        page_size: int = 256
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        사용자의 모든 기억을 페이지 단위로 순회 (scroll의 next_page_offset 커서 사용)
 
-            # Qdrant scroll (전체 조회)
-            scroll_results = self.client.scroll(
+        Args:
+            user_id: 사용자 ID
+            memory_type: 기억 유형 필터 (옵션)
+            page_size: scroll 1회당 가져올 개수
+
+        Yields:
+            기억 정보 (id, content, type, metadata)
+        """
+        query_filter = _compile_filter(user_id, memory_type)
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
                 collection_name=self.collection_name,
                 scroll_filter=query_filter,
-                limit=limit,  # 파라미터로 받은 limit 사용
+                limit=page_size,
+                offset=offset,
                 with_payload=True,
                 with_vectors=False,
             )
-
-            # 결과 포맷팅
-            memories = []
-            for point in scroll_results[0]:
-                memories.append({
+            for point in points:
+                yield {
                     "id": point.id,
                     "content": point.payload.get("content", ""),  # 'content' 키로 변경
                     "type": point.payload.get("memory_type", "unknown"),  # 'type' 키 추가
                     "metadata": point.payload,
-                })
+                }
+            if offset is None:
+                break
+
+    def get_all_memories(
+        self,
+        user_id: str,
+        memory_type: Optional[str] = None,
+        limit: Optional[int] = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        사용자의 모든 기억 조회
 
-            print(f"[📋] Retrieved {len(memories)} memories for user '{user_id}'")
+        Args:
+            user_id: 사용자 ID
+            memory_type: 기억 유형 필터 (옵션)
+            limit: 최대 반환 개수 (기본값: 100, None이면 전체)
+
+        Returns:
+            모든 기억 리스트
+        """
+        try:
+            # limit이 작으면 한 페이지로 끝나도록 page_size를 맞춤
+            page_size = min(limit, 256) if limit else 256
+            memories = list(islice(self.iter_all_memories(user_id, memory_type, page_size), limit))
+
+            logger.debug("Retrieved %d memories user=%s", len(memories), user_id)
             return memories
         except Exception as e:
-            print(f"[❌] Failed to get all memories: {e}")
+            logger.error("Failed to get all memories: %s", e)
             raise
 
-    def get_memory_by_id(self, memory_id: str) -> Optional[Dict[str, Any]]:
+    def get_memory_by_id(self, memory_id: Union[int, str]) -> Optional[Dict[str, Any]]:
         """
         ID로 특정 기억 조회
 
@@ -333,7 +668,9 @@ class ManagerMMemory:
         try:
             result = self.client.retrieve(
                 collection_name=self.collection_name,
-                ids=[memory_id],
+                ids=[_point_id(memory_id)],
+                with_payload=True,
+                with_vectors=False,
             )
 
             if result and len(result) > 0:
@@ -348,15 +685,19 @@ class ManagerMMemory:
                 return None
 
         except Exception as e:
-            print(f"[❌] Failed to retrieve memory {memory_id}: {e}")
+            logger.error("Failed to retrieve memory %s: %s", memory_id, e)
             return None
 
-    def delete_memory(self, memory_id: str) -> Dict[str, Any]:
+    def delete_memory(self, memory_id: Union[int, str], wait: bool = False) -> Dict[str, Any]:
         """
         특정 기억 삭제
 
+        Note: 기본값(wait=False)은 Qdrant가 삭제를 접수하면 바로 반환하므로,
+              직후의 조회에는 삭제된 기억이 잠시 보일 수 있습니다.
+
         Args:
             memory_id: 삭제할 기억의 ID
+            wait: True면 삭제가 반영될 때까지 대기 (즉시 일관성이 필요한 경우)
 
         Returns:
             삭제 결과
@@ -364,20 +705,24 @@ class ManagerMMemory:
         try:
             self.client.delete(
                 collection_name=self.collection_name,
-                points_selector=[memory_id],
+                points_selector=[_point_id(memory_id)],
+                wait=wait,
             )
-            print(f"[🗑️] Memory deleted: {memory_id}")
+            logger.debug("Memory deleted: %s", memory_id)
             return {"status": "deleted", "memory_id": memory_id}
         except Exception as e:
-            print(f"[❌] Failed to delete memory: {e}")
+            logger.error("Failed to delete memory: %s", e)
             raise
 
-    def delete_all_memories(self, user_id: str) -> Dict[str, Any]:
+    def delete_all_memories(self, user_id: str, wait: bool = False) -> Dict[str, Any]:
         """
         사용자의 모든 기억 삭제
 
+        Note: 기본값(wait=False)은 삭제 반영을 기다리지 않고 반환합니다 (delete_memory와 동일).
+
         Args:
             user_id: 사용자 ID
+            wait: True면 삭제가 반영될 때까지 대기
 
         Returns:
             삭제 결과
@@ -386,24 +731,18 @@ class ManagerMMemory:
             # 필터로 해당 사용자의 모든 포인트 삭제
             self.client.delete(
                 collection_name=self.collection_name,
-                points_selector=Filter(
-                    must=[
-                        FieldCondition(
-                            key="user_id",
-                            match=MatchValue(value=user_id),
-                        )
-                    ]
-                ),
+                points_selector=_compile_filter(user_id),
+                wait=wait,
             )
-            print(f"[🗑️] All memories deleted for user '{user_id}'")
+            logger.info("All memories deleted user=%s", user_id)
             return {"status": "deleted", "user_id": user_id}
         except Exception as e:
-            print(f"[❌] Failed to delete all memories: {e}")
+            logger.error("Failed to delete all memories: %s", e)
             raise
 
     def update_memory(
         self,
-        memory_id: str,
+        memory_id: Union[int, str],
         content: str
     ) -> Dict[str, Any]:
         """
@@ -414,52 +753,53 @@ class ManagerMMemory:
             content: 새로운 내용
 
         Returns:
-            업데이트 결과
+            업데이트 결과 (metadata에는 변경된 필드만 포함)
+
+        Raises:
+            ValueError: 해당 ID의 기억이 없는 경우
         """
         try:
-            # 기존 메모리 가져오기
-            existing = self.client.retrieve(
-                collection_name=self.collection_name,
-                ids=[memory_id],
-                with_payload=True,
-            )
-
-            if not existing:
-                raise ValueError(f"Memory not found: {memory_id}")
-
             # 새 임베딩 생성
             embedding = self.embedder.embed_query(content)
+            memory_id = _point_id(memory_id)
 
-            # 기존 메타데이터 유지하고 업데이트
-            payload = existing[0].payload
-            payload["content"] = content
-            payload["updated_at"] = datetime.now().isoformat()
-
-            # 업데이트 (upsert 사용)
-            self.client.upsert(
+            # 벡터 교체 (존재하지 않는 ID면 Qdrant가 404/NOT_FOUND 오류 반환)
+            try:
+                self.client.update_vectors(
+                    collection_name=self.collection_name,
+                    points=[PointVectors(id=memory_id, vector=embedding)],
+                )
+            except Exception as e:
+                if _is_not_found(e):
+                    raise ValueError(f"Memory not found: {memory_id}") from e
+                raise
+
+            # 변경된 필드만 병합 (나머지 기존 메타데이터는 서버에서 유지)
+            now_iso, now_ns = _timestamps()
+            payload = {
+                "content": content,
+                "updated_at": now_iso,
+                "updated_at_ns": now_ns,
+            }
+            self.client.set_payload(
                 collection_name=self.collection_name,
-                points=[
-                    PointStruct(
-                        id=memory_id,
-                        vector=embedding,
-                        payload=payload,
-                    )
-                ],
+                payload=payload,
+                points=[memory_id],
             )
 
-            print(f"[♻️] Memory updated: {memory_id}")
+            logger.debug("Memory updated: %s", memory_id)
             return {
                 "id": memory_id,
                 "content": content,
                 "metadata": payload,
             }
         except Exception as e:
-            print(f"[❌] Failed to update memory: {e}")
+            logger.error("Failed to update memory: %s", e)
             raise
 
     def get_memory_history(
         self,
-        memory_id: str
+        memory_id: Union[int, str]
     ) -> List[Dict[str, Any]]:
         """
         특정 기억 조회 (히스토리는 현재 미지원)
@@ -476,21 +816,22 @@ class ManagerMMemory:
         try:
             memory = self.client.retrieve(
                 collection_name=self.collection_name,
-                ids=[memory_id],
-                with_payload=True,
+                ids=[_point_id(memory_id)],
+                with_payload=self.HISTORY_PAYLOAD,
+                with_vectors=False,
             )
 
             if not memory:
                 return []
 
-            print(f"[📜] Retrieved memory: {memory_id}")
+            logger.debug("Retrieved memory: %s", memory_id)
             return [{
                 "id": memory[0].id,
                 "content": memory[0].payload.get("content", ""),
                 "metadata": memory[0].payload,
             }]
         except Exception as e:
-            print(f"[❌] Failed to get memory: {e}")
+            logger.error("Failed to get memory: %s", e)
             raise
 
     def get_user_context_summary(
@@ -510,22 +851,54 @@ class ManagerMMemory:
         Returns:
             포맷된 컨텍스트 문자열
         """
-        memories = self.get_all_memories(user_id, memory_type)
-
-        if not memories:
+        query_filter = _compile_filter(user_id, memory_type)
+        # 헤더 표시용 개수는 payload 인덱스 기반 근사치로 충분 (전체 포인트를 세지 않음)
+        total = self.client.count(
+            collection_name=self.collection_name,
+            count_filter=query_filter,
+            exact=False,
+        ).count
+
+        # 최근 기억만 조회 (Qdrant에서 created_at_ns 내림차순 정렬 후 상위 max_memories개)
+        points, _ = self.client.scroll(
+            collection_name=self.collection_name,
+            scroll_filter=query_filter,
+            order_by=OrderBy(key="created_at_ns", direction=Direction.DESC),
+            limit=max_memories,
+            with_payload=self.SUMMARY_PAYLOAD,
+            with_vectors=False,
+        )
+        recent_memories = [
+            {
+                "id": point.id,
+                "content": point.payload.get("content", ""),
+                "type": point.payload.get("memory_type", "unknown"),
+                "metadata": point.payload,
+            }
+            for point in points
+        ]
+
+        # created_at_ns가 없는 이전 데이터는 order_by 결과에서 빠지므로 기존 방식(전체 조회 후 정렬)으로 대체
+        if len(recent_memories) < min(total, max_memories):
+            memories = self.get_all_memories(user_id, memory_type, limit=None)
+            recent_memories = sorted(
+                memories,
+                key=lambda x: x.get("metadata", {}).get("created_at", ""),
+                reverse=True
+            )[:max_memories]
+
+        if not recent_memories:
             return f"No previous context available for user '{user_id}'."
 
-        # 최근 기억만 선택 (created_at 기준 정렬)
-        sorted_memories = sorted(
-            memories,
-            key=lambda x: x.get("metadata", {}).get("created_at", ""),
-            reverse=True
-        )
-        recent_memories = sorted_memories[:max_memories]
+        # max_memories보다 적게 조회됐다면 전체를 본 것이므로 정확한 개수로, 아니면 근사치 하한만 보정
+        if len(recent_memories) < max_memories:
+            total = len(recent_memories)
+        else:
+            total = max(total, len(recent_memories))
 
         # 포맷팅
         context = f"=== User Context for '{user_id}' ===\n"
-        context += f"Total memories: {len(memories)} (showing recent {len(recent_memories)})\n\n"
+        context += f"Total memories: {total} (showing recent {len(recent_memories)})\n\n"
 
         for idx, mem in enumerate(recent_memories, 1):
             memory_text = mem.get("content", "")  # 'content' 키로 변경
@@ -3,41 +3,228 @@ OpenAI Embedding API와 통신하는 어댑터 (text-embedding-3-large 전용)
 """
 
 from langchain.embeddings.base import Embeddings
-from typing import List
+from array import array
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import hashlib
 import os
-from openai import OpenAI
+import sqlite3
+import threading
+import time
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+
+# 모든 OpenAIEmbedderAdapter 인스턴스가 공유하는 HTTP/2 keep-alive 연결 풀
+_shared_http_client: Optional[httpx.Client] = None
+_shared_http_client_lock = threading.Lock()
+
+
+def get_shared_http_client() -> httpx.Client:
+    """프로세스 공용 httpx.Client (첫 호출 시 생성)"""
+    global _shared_http_client
+    with _shared_http_client_lock:
+        if _shared_http_client is None or _shared_http_client.is_closed:
+            _shared_http_client = httpx.Client(
+                http2=True,
+                timeout=60.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=100),
+            )
+        return _shared_http_client
+
+
+def _as_float32(vector: List[float]) -> "array[float]":
+    """임베딩을 float32 배열로 변환 (Python float 리스트 대비 원소당 4바이트)"""
+    return array("f", vector)
+
+
+class _EmbedCache:
+    """
+    (model, dimensions, text) → 임베딩 exact-match LRU 캐시 (TTL 지원, thread-safe)
+
+    텍스트는 blake2b 다이제스트로 키를 만들어 긴 문자열을 그대로 보관하지 않고,
+    벡터는 float32 배열로 보관해 항목당 메모리를 줄입니다.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Tuple[str, int, bytes], Tuple[float, array]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, dimensions: int, text: str) -> Tuple[str, int, bytes]:
+        return (model, dimensions, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest())
+
+    def get(self, key) -> Optional[List[float]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, vector = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return vector.tolist()
+
+    def put(self, key, vector: List[float]):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, _as_float32(vector))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class EmbeddingCacheSQLite:
+    """
+    sha256(model:dimensions:text) → float32 임베딩 blob 영구 캐시 (SQLite, thread-safe)
+
+    워커 재시작 후에도 유지되므로 같은 코퍼스를 다시 임베딩할 때 API 호출을 건너뜁니다.
+    """
+
+    # SQLite 바인드 변수 상한(999)보다 작게 IN (...) 조회를 분할
+    _LOOKUP_CHUNK = 500
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, embedding BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, dimensions: int, text: str) -> bytes:
+        return hashlib.sha256(f"{model}:{dimensions}:{text}".encode("utf-8")).digest()
+
+    @staticmethod
+    def _encode(vector: List[float]) -> bytes:
+        return _as_float32(vector).tobytes()
+
+    @staticmethod
+    def _decode(blob: bytes) -> List[float]:
+        vector = array("f")
+        vector.frombytes(blob)
+        return vector.tolist()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, List[float]]:
+        """여러 키를 한 번에 조회 (hit된 키만 반환)"""
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for i in range(0, len(unique), self._LOOKUP_CHUNK):
+                chunk = unique[i:i + self._LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT hash, embedding FROM embeddings WHERE hash IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = self._decode(blob)
+        return found
+
+    def put_many(self, items: List[Tuple[bytes, List[float]]]):
+        """(키, 임베딩) 목록을 한 트랜잭션으로 저장"""
+        if not items:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (hash, embedding) VALUES (?, ?)",
+                [(key, self._encode(vector)) for key, vector in items],
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
 
 
 class OpenAIEmbedderAdapter(Embeddings):
     """OpenAI Embedding API를 사용하는 어댑터 (text-embedding-3-large)"""
 
-    # text-embedding-3-large의 기본 차원
-    DEFAULT_DIMENSIONS = 3072
+    # text-embedding-3-large는 Matryoshka 학습 모델이라 앞쪽 1024차원만 써도 검색 품질 손실이 작음
+    # (모델 최대 차원: 3072, API가 dimensions 파라미터로 서버 측에서 잘라서 반환)
+    DEFAULT_DIMENSIONS = 1024
+
+    # embeddings API 요청 1회당 입력 개수 상한
+    MAX_BATCH_SIZE = 2048
 
     def __init__(
         self,
         api_key: str = None,
         dimensions: int = None,
+        cache_size: int = 1000,
+        cache_ttl: float = 300.0,
+        http_client: Optional[httpx.Client] = None,
+        persistent_cache_path: Optional[str] = None,
+        batch_size: int = MAX_BATCH_SIZE,
+        max_concurrency: int = 5,
+        max_retries: int = 5,
     ):
         """
         OpenAI Embedder 초기화
 
         Args:
             api_key: OpenAI API 키 (기본값: 환경변수에서 로드)
-            dimensions: 임베딩 차원 (기본값: 3072)
+            dimensions: 임베딩 차원 (기본값: 1024)
                        - 1 ~ 3072 사이의 값으로 설정 가능
                        - 작은 값을 사용하면 비용 절감 및 성능 향상
+            cache_size: 임베딩 캐시 최대 항목 수 (0이면 캐시 비활성화)
+            cache_ttl: 캐시 항목 유효 시간 (초)
+            http_client: OpenAI 클라이언트가 사용할 httpx.Client
+                         (기본값: 프로세스 공용 HTTP/2 연결 풀)
+            persistent_cache_path: SQLite 영구 캐시 파일 경로
+                                   (기본값: 환경변수 OPENAI_EMBEDDING_CACHE_PATH, 없으면 비활성화)
+            batch_size: 요청 1회당 텍스트 수 (최대 2048)
+            max_concurrency: 동시에 보낼 배치 요청 수 (429 폭주 방지)
+            max_retries: 429/5xx 재시도 횟수 (SDK가 Retry-After와 지수 백오프+jitter 적용)
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY in .env or pass api_key parameter.")
 
-        self.client = OpenAI(api_key=self.api_key)
+        self.max_retries = max_retries
+        self.client = OpenAI(
+            api_key=self.api_key,
+            http_client=http_client or get_shared_http_client(),
+            max_retries=max_retries,
+        )
+        # 비동기 클라이언트는 이벤트 루프 안에서 처음 사용할 때 생성
+        self._aclient: Optional[AsyncOpenAI] = None
+        self.batch_size = min(batch_size, self.MAX_BATCH_SIZE)
+        self.max_concurrency = max_concurrency
         self.model = "text-embedding-3-large"
         self.dimensions = dimensions or self.DEFAULT_DIMENSIONS
+        self._cache = _EmbedCache(maxsize=cache_size, ttl=cache_ttl)
+
+        persistent_cache_path = persistent_cache_path or os.getenv("OPENAI_EMBEDDING_CACHE_PATH")
+        self._disk_cache = EmbeddingCacheSQLite(persistent_cache_path) if persistent_cache_path else None
 
         print(f"[🔗] Initializing OpenAI Embedder: {self.model}")
         print(f"    - Dimensions: {self.dimensions}")
+        if self._disk_cache is not None:
+            print(f"    - Persistent cache: {persistent_cache_path}")
 
     def get_embedding_dimensions(self) -> int:
         """
@@ -48,6 +235,37 @@ class OpenAIEmbedderAdapter(Embeddings):
         """
         return self.dimensions
 
+    def _lookup_cached(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """메모리 LRU → SQLite 영구 캐시 순으로 조회 (miss는 None)"""
+        results = [
+            self._cache.get(_EmbedCache.make_key(self.model, self.dimensions, text)) for text in texts
+        ]
+        if self._disk_cache is None:
+            return results
+
+        disk_keys = {
+            i: EmbeddingCacheSQLite.make_key(self.model, self.dimensions, texts[i])
+            for i, vector in enumerate(results) if vector is None
+        }
+        if disk_keys:
+            found = self._disk_cache.get_many(list(disk_keys.values()))
+            for i, key in disk_keys.items():
+                vector = found.get(key)
+                if vector is not None:
+                    results[i] = vector
+                    self._cache.put(_EmbedCache.make_key(self.model, self.dimensions, texts[i]), vector)
+        return results
+
+    def _store(self, texts: List[str], vectors: List[List[float]]):
+        """새로 받은 임베딩을 메모리/영구 캐시에 저장"""
+        for text, vector in zip(texts, vectors):
+            self._cache.put(_EmbedCache.make_key(self.model, self.dimensions, text), vector)
+        if self._disk_cache is not None:
+            self._disk_cache.put_many([
+                (EmbeddingCacheSQLite.make_key(self.model, self.dimensions, text), vector)
+                for text, vector in zip(texts, vectors)
+            ])
+
     def embed_query(self, text: str) -> List[float]:
         """
         단일 텍스트 임베딩
@@ -58,20 +276,52 @@ class OpenAIEmbedderAdapter(Embeddings):
         Returns:
             임베딩 벡터
         """
+        cached = self._lookup_cached([text])[0]
+        if cached is not None:
+            return cached
+
         try:
             response = self.client.embeddings.create(
                 input=text,
                 model=self.model,
                 dimensions=self.dimensions,
             )
-            return response.data[0].embedding
+            # 캐시 hit/miss와 관계없이 같은 값을 돌려주도록 float32로 정규화
+            embedding = _as_float32(response.data[0].embedding).tolist()
+            self._store([text], [embedding])
+            return embedding
         except Exception as e:
             print(f"[❌] OpenAI embedding failed: {e}")
             raise
 
+    def _chunk(self, texts: List[str]) -> List[List[str]]:
+        """batch_size 단위로 분할"""
+        return [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+    @staticmethod
+    def _missing_texts(texts: List[str], results: List[Optional[List[float]]]) -> List[str]:
+        """캐시 miss 텍스트 (중복 제거, 첫 등장 순서 유지)"""
+        return list(dict.fromkeys(text for text, vector in zip(texts, results) if vector is None))
+
+    def _merge_results(self, texts, results, missing, batches) -> List[List[float]]:
+        """배치 결과를 캐시에 저장하고 (중복 텍스트 포함) 입력 순서대로 채움"""
+        vectors = [vector for batch in batches for vector in batch]
+        embedded = dict(zip(missing, vectors))
+        self._store(missing, vectors)
+        return [embedded[text] if vector is None else vector for text, vector in zip(texts, results)]
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """텍스트 배치 하나를 임베딩"""
+        response = self.client.embeddings.create(
+            input=texts,
+            model=self.model,
+            dimensions=self.dimensions,
+        )
+        return [_as_float32(item.embedding).tolist() for item in response.data]
+
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """
-        여러 텍스트 배치 임베딩
+        여러 텍스트 배치 임베딩 (중복 제거한 캐시 미스만 batch_size 단위로 나눠 병렬 요청, 순서 유지)
 
         Args:
             texts: 임베딩할 텍스트 리스트
@@ -79,13 +329,78 @@ class OpenAIEmbedderAdapter(Embeddings):
         Returns:
             임베딩 벡터 리스트
         """
+        results = self._lookup_cached(texts)
+        missing = self._missing_texts(texts, results)
+        if not missing:
+            return results
+
         try:
-            response = self.client.embeddings.create(
-                input=texts,
-                model=self.model,
-                dimensions=self.dimensions,
+            chunks = self._chunk(missing)
+            if len(chunks) == 1:
+                batches = [self._embed_batch(chunks[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(chunks))) as executor:
+                    batches = list(executor.map(self._embed_batch, chunks))
+        except Exception as e:
+            print(f"[❌] OpenAI batch embedding failed: {e}")
+            raise
+
+        return self._merge_results(texts, results, missing, batches)
+
+    def _get_async_client(self) -> AsyncOpenAI:
+        """비동기 OpenAI 클라이언트 (인스턴스당 1개 재사용)"""
+        if self._aclient is None:
+            self._aclient = AsyncOpenAI(
+                api_key=self.api_key,
+                http_client=httpx.AsyncClient(
+                    http2=True,
+                    timeout=60.0,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=100),
+                ),
+                max_retries=self.max_retries,
             )
-            return [item.embedding for item in response.data]
+        return self._aclient
+
+    async def aclose(self):
+        """비동기 클라이언트 종료"""
+        if self._aclient is not None:
+            await self._aclient.close()
+            self._aclient = None
+
+    async def _aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """텍스트 배치 하나를 임베딩 (비동기)"""
+        response = await self._get_async_client().embeddings.create(
+            input=texts,
+            model=self.model,
+            dimensions=self.dimensions,
+        )
+        return [_as_float32(item.embedding).tolist() for item in response.data]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        여러 텍스트 배치 임베딩 (비동기, 배치를 max_concurrency 만큼 동시 요청)
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+
+        Returns:
+            임베딩 벡터 리스트
+        """
+        results = self._lookup_cached(texts)
+        missing = self._missing_texts(texts, results)
+        if not missing:
+            return results
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(chunk):
+            async with semaphore:
+                return await self._aembed_batch(chunk)
+
+        try:
+            batches = await asyncio.gather(*(run(chunk) for chunk in self._chunk(missing)))
         except Exception as e:
             print(f"[❌] OpenAI batch embedding failed: {e}")
             raise
+
+        return self._merge_results(texts, results, missing, batches)
@@ -4,19 +4,27 @@ Streamlit HITL UI - Team-H Graph
 통합 에이전트 시스템 with Human-in-the-Loop
 """
 
+import html
+import logging
 import sys
-import os
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Dict, List, Tuple
 import streamlit as st
 from dotenv import load_dotenv
 import uuid
 
+# Streamlit은 rerun마다 이 스크립트를 다시 실행하므로 이미 추가된 경우 sys.path에 중복 추가하지 않음
 project_root = Path(__file__).resolve().parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 # 프로젝트 루트의 .env 로드
 load_dotenv(project_root / ".env")
 
+logger = logging.getLogger(__name__)
+
 # Note: TeamHGraph import 제거됨 (백엔드 분리 원칙)
 # FastAPI (api/main.py)가 TeamHGraph를 관리하고,
 # 이 Streamlit 앱은 FastAPI 클라이언트로만 동작합니다.
@@ -27,17 +35,16 @@ from streamlits.ui.components import (
     create_session_state_defaults,
     render_error_expander,
     render_audio_input_widget,
+    get_api_client,
 )
 from streamlits.ui.approval import render_approval_ui_refactored
 from streamlits.core.config import (
     PAGE_CONFIGS,
+    AGENT_INFO,
     DEFAULT_VALUES,
     get_env_defaults,
 )
 
-# FastAPI 클라이언트 import
-from streamlits.utils.fastapi_client import FastAPIClient
-
 # 페이지 설정
 page_config = PAGE_CONFIGS["team_h"]
 st.set_page_config(
@@ -60,7 +67,7 @@ def initialize_session_state():
     # session_id = PostgreSQL thread_id = Langfuse session_id
     if "session_id" not in st.session_state:
         st.session_state.session_id = str(uuid.uuid4())
-        print(f"[🆕] New session created: {st.session_state.session_id}")
+        logger.debug("New session created: %s", st.session_state.session_id)
 
     create_session_state_defaults(
         messages=[],
@@ -71,8 +78,7 @@ def initialize_session_state():
         # UI 설정
         view_mode="💬 채팅",  # 화면 모드 (채팅/옵션)
         input_mode="💬 텍스트",  # 입력 방식 (텍스트/음성)
-        # FastAPI 클라이언트
-        api_client=FastAPIClient(base_url=os.getenv("FASTAPI_URL", "http://localhost:8000")),
+        render_window=RENDER_WINDOW,  # 화면에 그릴 최근 메시지 개수
     )
 
 
@@ -87,6 +93,308 @@ def initialize_session_state():
 # ============================================================================
 # 응답은 SSE 스트림으로 실시간 수신됩니다
 
+# 채팅 히스토리를 한 번에 그리는 최근 메시지 개수 (이전 메시지는 "이전 메시지 더 보기"로 확장)
+RENDER_WINDOW = 40
+
+# 토큰 표시 갱신 최소 간격 (초) - 이 간격 안에 들어온 토큰은 모아서 한 번에 표시
+STREAM_FLUSH_INTERVAL = 0.033
+
+def render_agent_responses(placeholder, agent_responses, trailing_divider: bool = False):
+    """
+    완료된 agent 응답들을 markdown으로 렌더링
+
+    Args:
+        placeholder: 렌더링할 st.empty() placeholder
+        agent_responses: [(agent_name, avatar, response_text), ...]
+        trailing_divider: 마지막 응답 뒤에도 구분선 표시 (아래에 스트리밍 중인 응답이 이어질 때)
+    """
+    with placeholder.container():
+        for idx, (agent_name, agent_avatar, response) in enumerate(agent_responses):
+            st.markdown(f"**{agent_avatar} {agent_name}**")
+            st.markdown(response)
+            if trailing_divider or idx < len(agent_responses) - 1:
+                st.markdown("---")  # 구분선
+
+
+def render_live_response(placeholder, agent_name: str, avatar: str, text: str, streaming: bool = True):
+    """
+    현재 agent 응답 표시
+
+    스트리밍 중에는 markdown 파싱 없이 줄바꿈만 유지한 일반 텍스트로 표시하고,
+    응답이 끝나면 (streaming=False) 전체 markdown으로 한 번 렌더링합니다.
+
+    Args:
+        placeholder: 렌더링할 st.empty() placeholder
+        agent_name: 현재 agent 이름
+        avatar: 현재 agent 아이콘
+        text: 지금까지 받은 응답 텍스트
+        streaming: 스트리밍 중 여부
+    """
+    if streaming:
+        placeholder.markdown(
+            f"**{avatar} {agent_name}**\n\n"
+            # <div>는 빈 줄에서 HTML 블록이 끝나 이후가 markdown으로 파싱되므로 <pre> 사용 (▌: 커서 표시)
+            f"<pre style='white-space: pre-wrap; font-family: inherit'>{html.escape(text)}▌</pre>",
+            unsafe_allow_html=True,
+        )
+    else:
+        placeholder.markdown(f"**{avatar} {agent_name}**\n\n{text}")
+
+
+@dataclass
+class StreamState:
+    """SSE 스트림 처리 중 화면/응답 상태"""
+    logs_container: Any
+    history_placeholder: Any
+    live_placeholder: Any
+    full_response: str = ""
+    current_agent_name: str = "Assistant"
+    avatar: str = "🤖"  # 기본 아이콘
+    # Agent별 응답 저장 (handoff 시 여러 agent가 응답)
+    agent_responses: List[Tuple[str, str, str]] = field(default_factory=list)  # [(agent_name, avatar, response_text), ...]
+    # 마지막으로 live 응답을 다시 그린 시각 (토큰 묶음 표시용)
+    last_flush: float = 0.0
+
+
+def _finish_current_response(state: StreamState):
+    """현재 agent 응답을 완료 목록에 저장"""
+    if state.full_response:
+        state.agent_responses.append((state.current_agent_name, state.avatar, state.full_response))
+        state.full_response = ""
+
+
+def _save_agent_responses(state: StreamState):
+    """완료된 agent 응답들을 채팅 히스토리에 저장 (각 agent별로 개별 메시지)"""
+    for agent_name, agent_avatar, response in state.agent_responses:
+        st.session_state.messages.append({
+            "role": "assistant",
+            "content": response,
+            "agent_name": agent_name,
+        })
+    state.agent_responses.clear()
+
+
+def _set_current_agent(event: Dict[str, Any], state: StreamState):
+    """이벤트의 current_agent로 표시할 agent 이름/아이콘 설정"""
+    agent_code = event.get("current_agent")
+    if agent_code in AGENT_INFO:
+        state.current_agent_name, state.avatar = AGENT_INFO[agent_code]
+
+
+def _on_agent_start(event: Dict[str, Any], state: StreamState):
+    """Agent 시작 이벤트 (초기 agent 정보)"""
+    _set_current_agent(event, state)
+
+
+def _on_agent_change(event: Dict[str, Any], state: StreamState):
+    """Agent 변경 이벤트 (handoff 발생)"""
+    # 이전 agent의 응답 저장
+    if state.full_response:
+        _finish_current_response(state)
+        render_agent_responses(state.history_placeholder, state.agent_responses, trailing_divider=True)
+        state.live_placeholder.empty()
+
+    # 새 agent 정보 설정
+    _set_current_agent(event, state)
+
+
+def _on_token(event: Dict[str, Any], state: StreamState):
+    """토큰 스트리밍 (실시간 표시)"""
+    state.full_response += event.get("content", "")
+
+    # 현재 agent의 응답만 갱신 (이전 agent 응답은 다시 그리지 않음)
+    # 토큰마다 그리지 않고 STREAM_FLUSH_INTERVAL마다 누적된 텍스트를 표시
+    # (llm_end/agent_change/done에서 최종 텍스트를 다시 그리므로 마지막 토큰도 누락되지 않음)
+    now = time.monotonic()
+    if now - state.last_flush >= STREAM_FLUSH_INTERVAL:
+        render_live_response(state.live_placeholder, state.current_agent_name, state.avatar, state.full_response)
+        state.last_flush = now
+
+
+def _on_llm_end(event: Dict[str, Any], state: StreamState):
+    """LLM 완료"""
+    state.full_response = event.get("full_message", state.full_response)
+    # 스트리밍이 끝난 응답은 markdown으로 한 번만 렌더링
+    if state.full_response:
+        render_live_response(
+            state.live_placeholder, state.current_agent_name, state.avatar, state.full_response, streaming=False
+        )
+
+
+def _on_router_decision(event: Dict[str, Any], state: StreamState):
+    """라우터 결정"""
+    target = event.get("target_agent", "unknown")
+    reason = event.get("reason", "No reason provided")
+
+    # Agent 이름 매핑
+    target_name = AGENT_INFO[target][0] if target in AGENT_INFO else target
+
+    with state.logs_container:
+        with st.status(f"🔀 라우팅: {target_name}", state="complete", expanded=False):
+            st.write(f"**사유:** {reason}")
+
+
+def _on_tool_start(event: Dict[str, Any], state: StreamState):
+    """툴 실행"""
+    tool_name = event.get("tool_name")
+    with state.logs_container:
+        with st.status(f"🛠️ {tool_name} 실행 중...", expanded=False):
+            st.write(f"입력: {event.get('tool_input', {})}")
+
+
+def _on_interrupt(event: Dict[str, Any], state: StreamState):
+    """인터럽트 (HITL)"""
+    # 마지막 agent 응답도 저장
+    _finish_current_response(state)
+
+    _save_agent_responses(state)
+
+    st.session_state.pending_approval = {
+        "interrupt": event.get("interrupt"),
+        "thread_id": st.session_state.session_id,
+        "user_id": st.session_state.user_id,
+        "session_id": st.session_state.session_id,
+    }
+
+    # rerun 없이 현재 실행에서 바로 승인 UI 표시 (히스토리 전체를 다시 그리지 않음)
+    if render_approval_ui_refactored():
+        st.info("👆 위의 작업을 승인 또는 거부해주세요")
+    st.stop()
+
+
+def _on_done(event: Dict[str, Any], state: StreamState):
+    """완료"""
+    # 마지막 agent의 응답 저장
+    _finish_current_response(state)
+
+    # 최종 메시지 표시 (모든 agent 응답)
+    if state.agent_responses:
+        render_agent_responses(state.history_placeholder, state.agent_responses)
+        state.live_placeholder.empty()
+
+
+def _on_error(event: Dict[str, Any], state: StreamState):
+    """오류"""
+    st.error(f"❌ 오류: {event.get('error')}")
+    with st.expander("상세 오류"):
+        st.code(event.get("traceback", ""))
+
+
+# SSE 이벤트 타입 → 핸들러
+STREAM_HANDLERS = {
+    "agent_start": _on_agent_start,
+    "agent_change": _on_agent_change,
+    "token": _on_token,
+    "llm_end": _on_llm_end,
+    "router_decision": _on_router_decision,
+    "tool_start": _on_tool_start,
+    "interrupt": _on_interrupt,
+    "done": _on_done,
+    "error": _on_error,
+}
+
+
+def handle_prompt(prompt: str):
+    """
+    사용자 입력을 FastAPI로 전송하고 SSE 응답을 스트리밍 표시
+
+    Args:
+        prompt: 사용자 메시지 (텍스트 또는 음성 인식 결과)
+    """
+    # 사용자 메시지
+    st.session_state.messages.append({"role": "user", "content": prompt})
+    display_chat_message("user", prompt)
+
+    # FastAPI를 통한 스트리밍 실행
+    try:
+        # 툴/라우터 로그를 위한 컨테이너를 먼저 생성 (사용자 메시지와 AI 응답 사이)
+        logs_container = st.container()
+
+        # 응답 표시 영역: 완료된 agent 응답(history)과 스트리밍 중인 응답(live)을 분리
+        # history는 agent가 바뀔 때만 다시 그리고, 토큰마다 live만 교체
+        with st.container():
+            history_placeholder = st.empty()
+            live_placeholder = st.empty()
+
+        state = StreamState(
+            logs_container=logs_container,
+            history_placeholder=history_placeholder,
+            live_placeholder=live_placeholder,
+        )
+
+        # FastAPI SSE 스트림 (이벤트 타입별 핸들러로 바로 분기, 모르는 이벤트는 무시)
+        for event in get_api_client().chat_stream(
+            message=prompt,
+            thread_id=st.session_state.session_id,
+            user_id=st.session_state.user_id,
+        ):
+            handler = STREAM_HANDLERS.get(event.get("event"))
+            if handler is not None:
+                handler(event, state)
+
+        # 메시지 저장 (각 agent별로 개별 메시지)
+        _save_agent_responses(state)
+
+    except Exception as e:
+        error_msg = f"❌ FastAPI 연결 오류: {e}"
+        st.error(error_msg)
+        st.session_state.messages.append({
+            "role": "assistant",
+            "content": error_msg,
+        })
+        render_error_expander("상세 오류")
+
+
+@st.fragment
+def chat_fragment():
+    """
+    채팅 화면 (승인 UI, 히스토리, 입력, 응답 스트리밍)
+
+    fragment로 분리해 채팅 영역 안의 상호작용(메시지 전송, 음성 입력,
+    승인 화면 위젯)은 이 영역만 다시 실행하고 사이드바/옵션 화면은 다시 그리지 않습니다.
+    session_state는 앱 전체와 공유됩니다.
+    """
+    # 승인 대기 중이면 먼저 표시
+    if render_approval_ui_refactored():
+        st.info("👆 위의 작업을 승인 또는 거부해주세요")
+        st.stop()
+
+    # 채팅 히스토리 표시 (최근 render_window개만 그림, 전체 히스토리는 session_state에 유지)
+    messages = st.session_state.messages
+    hidden = len(messages) - st.session_state.render_window
+    if hidden > 0:
+        if st.button(f"⬆️ 이전 메시지 더 보기 ({hidden}개)", use_container_width=True):
+            st.session_state.render_window += RENDER_WINDOW
+            st.rerun(scope="fragment")
+        messages = messages[hidden:]
+
+    for msg in messages:
+        display_chat_message(
+            msg["role"],
+            msg["content"],
+            agent_name=msg.get("agent_name")
+        )
+        # 로그가 있으면 표시
+        if "logs" in msg and msg["logs"]:
+            with st.expander("📜 과정 로그 보기", expanded=False):
+                # 로그마다 요소를 만들지 않고 하나의 markdown 요소로 표시
+                st.markdown("\n\n".join(msg["logs"]))
+
+    # 입력 영역 (항상 화면 하단에 고정)
+    # 텍스트 입력은 항상 표시 (고정 위치)
+    prompt = st.chat_input("메시지 입력...")
+
+    # 음성 입력 처리 (음성 모드일 때만)
+    if st.session_state.input_mode == "🎤 음성":
+        st.caption("🎤 아래 녹음 버튼을 눌러 음성을 입력하세요")
+        audio_text = render_audio_input_widget("main_chat")
+        if audio_text:
+            prompt = audio_text
+
+    # 입력이 있을 때 처리
+    if prompt:
+        handle_prompt(prompt)
+
 
 # ============================================================================
 # 메인
@@ -116,7 +424,7 @@ with st.sidebar:
 
     st.divider()
 
-    # 세션 정보
+    # 세션 정보 (메시지 수는 채팅 fragment만 다시 실행될 때는 갱신되지 않고 다음 전체 실행 때 반영)
     st.info(f"""
 **📊 세션 정보**
 - Session ID: `{st.session_state.session_id[:8]}...`
@@ -135,27 +443,7 @@ with st.sidebar:
 
 # 채팅 화면
 if st.session_state.view_mode == "💬 채팅":
-    # 승인 대기 중이면 먼저 표시
-    if render_approval_ui_refactored():
-        st.info("👆 위의 작업을 승인 또는 거부해주세요")
-        st.stop()
-
-    # 채팅 히스토리 표시
-    for msg in st.session_state.messages:
-        display_chat_message(
-            msg["role"],
-            msg["content"],
-            agent_name=msg.get("agent_name")
-        )
-        # 로그가 있으면 표시
-        if "logs" in msg and msg["logs"]:
-            with st.expander("📜 과정 로그 보기", expanded=False):
-                for log in msg["logs"]:
-                    st.markdown(log)
-
-    # 입력 영역 (항상 화면 하단에 고정)
-    # 텍스트 입력은 항상 표시 (고정 위치)
-    prompt = st.chat_input("메시지 입력...")
+    chat_fragment()
 
 # ============================================================================
 # 옵션 화면
@@ -176,7 +464,8 @@ elif st.session_state.view_mode == "⚙️ 옵션":
         st.session_state.messages = []
         st.session_state.pending_approval = None
         st.session_state.approval_decisions = {}
-        print(f"[🔄] Session changed: {old_session[:8]}... → {st.session_state.session_id[:8]}...")
+        st.session_state.render_window = RENDER_WINDOW
+        logger.debug("Session changed: %s... -> %s...", old_session[:8], st.session_state.session_id[:8])
         st.success("새 대화를 시작했습니다!")
         st.rerun()
 
@@ -230,169 +519,5 @@ elif st.session_state.view_mode == "⚙️ 옵션":
     변경 후 FastAPI 서버를 재시작해야 합니다.
     """)
 
-# ============================================================================
-# 입력 처리 (화면 모드와 무관하게 실행)
-# ============================================================================
-
-# 음성 입력 처리 (채팅 화면이고 음성 모드일 때만)
-if st.session_state.view_mode == "💬 채팅" and st.session_state.input_mode == "🎤 음성":
-    st.caption("🎤 아래 녹음 버튼을 눌러 음성을 입력하세요")
-    audio_text = render_audio_input_widget("main_chat")
-    if audio_text:
-        prompt = audio_text
-
-# 입력이 있을 때 처리 (채팅 화면에서만)
-# prompt는 채팅 화면의 st.chat_input() 또는 음성 입력에서 정의됨
-if st.session_state.view_mode == "💬 채팅" and 'prompt' in locals() and prompt:
-    # 사용자 메시지
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    display_chat_message("user", prompt)
-
-    # FastAPI를 통한 스트리밍 실행
-    try:
-        # 툴/라우터 로그를 위한 컨테이너를 먼저 생성 (사용자 메시지와 AI 응답 사이)
-        logs_container = st.container()
-
-        # 응답을 실시간으로 표시할 placeholder (st.empty()로 내용 교체)
-        message_placeholder = st.empty()
-        full_response = ""
-        current_node = "unknown"
-        current_agent_name = "Assistant"
-        avatar = "🤖"  # 기본 아이콘
-
-        # Agent별 응답 저장 (handoff 시 여러 agent가 응답)
-        agent_responses = []  # [(agent_name, avatar, response_text), ...]
-
-        # Agent code → 이름/아이콘 매핑 (state의 current_agent 값 사용)
-        agent_to_info = {
-            "i": ("Manager I", "🏠"),
-            "m": ("Manager M", "🧠"),
-            "s": ("Manager S", "🔍"),
-            "t": ("Manager T", "📅"),
-        }
-
-        # FastAPI SSE 스트림
-        for event in st.session_state.api_client.chat_stream(
-            message=prompt,
-            thread_id=st.session_state.session_id,
-            user_id=st.session_state.user_id,
-        ):
-            event_type = event.get("event")
-
-            # Agent 시작 이벤트 (초기 agent 정보)
-            if event_type == "agent_start":
-                agent_code = event.get("current_agent")
-                if agent_code and agent_code in agent_to_info:
-                    current_agent_name, avatar = agent_to_info[agent_code]
-                    current_node = agent_code
-
-            # Agent 변경 이벤트 (handoff 발생)
-            elif event_type == "agent_change":
-                # 이전 agent의 응답 저장
-                if full_response:
-                    agent_responses.append((current_agent_name, avatar, full_response))
-                    full_response = ""  # 새 agent를 위해 리셋
-
-                # 새 agent 정보 설정
-                agent_code = event.get("current_agent")
-                if agent_code and agent_code in agent_to_info:
-                    current_agent_name, avatar = agent_to_info[agent_code]
-                    current_node = agent_code
-
-            # 토큰 스트리밍 (실시간 표시)
-            elif event_type == "token":
-                full_response += event.get("content", "")
-
-                # 전체 메시지 렌더링 (이전 agent들 + 현재 agent)
-                with message_placeholder.container():
-                    # 이전에 완료된 agent들의 응답 표시
-                    for prev_agent_name, prev_avatar, prev_response in agent_responses:
-                        st.markdown(f"**{prev_avatar} {prev_agent_name}**")
-                        st.markdown(prev_response)
-                        st.markdown("---")  # 구분선
-
-                    # 현재 agent의 응답 표시 (스트리밍 중)
-                    st.markdown(f"**{avatar} {current_agent_name}**")
-                    st.markdown(full_response + "▌")  # 커서 표시
-
-            # LLM 완료
-            elif event_type == "llm_end":
-                full_response = event.get("full_message", full_response)
-                # llm_end는 표시 업데이트 없이 full_message만 저장
-
-            # 라우터 결정
-            elif event_type == "router_decision":
-                target = event.get("target_agent", "unknown")
-                reason = event.get("reason", "No reason provided")
-
-                # Agent 이름 매핑
-                agent_names = {"i": "Manager I", "m": "Manager M", "s": "Manager S", "t": "Manager T"}
-                target_name = agent_names.get(target, target)
-
-                with logs_container:
-                    with st.status(f"🔀 라우팅: {target_name}", state="complete", expanded=False):
-                        st.write(f"**사유:** {reason}")
-
-            # 툴 실행
-            elif event_type == "tool_start":
-                tool_name = event.get("tool_name")
-                with logs_container:
-                    with st.status(f"🛠️ {tool_name} 실행 중...", expanded=False):
-                        st.write(f"입력: {event.get('tool_input', {})}")
-
-            # 인터럽트 (HITL)
-            elif event_type == "interrupt":
-                # 마지막 agent 응답도 저장
-                if full_response:
-                    agent_responses.append((current_agent_name, avatar, full_response))
-
-                st.session_state.pending_approval = {
-                    "interrupt": event.get("interrupt"),
-                    "thread_id": st.session_state.session_id,
-                    "user_id": st.session_state.user_id,
-                    "session_id": st.session_state.session_id,
-                }
-                st.warning("⏸️ 승인이 필요한 작업이 있습니다")
-                st.rerun()
-
-            # 완료
-            elif event_type == "done":
-                # 마지막 agent의 응답 저장
-                if full_response:
-                    agent_responses.append((current_agent_name, avatar, full_response))
-
-                # 최종 메시지 표시 (모든 agent 응답)
-                if agent_responses:
-                    with message_placeholder.container():
-                        for idx, (agent_name, agent_avatar, response) in enumerate(agent_responses):
-                            st.markdown(f"**{agent_avatar} {agent_name}**")
-                            st.markdown(response)
-                            # 마지막이 아니면 구분선
-                            if idx < len(agent_responses) - 1:
-                                st.markdown("---")
-
-            # 오류
-            elif event_type == "error":
-                st.error(f"❌ 오류: {event.get('error')}")
-                with st.expander("상세 오류"):
-                    st.code(event.get("traceback", ""))
-
-        # 메시지 저장 (각 agent별로 개별 메시지)
-        for agent_name, agent_avatar, response in agent_responses:
-            st.session_state.messages.append({
-                "role": "assistant",
-                "content": response,
-                "agent_name": agent_name,
-            })
-
-    except Exception as e:
-        error_msg = f"❌ FastAPI 연결 오류: {e}"
-        st.error(error_msg)
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": error_msg,
-        })
-        render_error_expander("상세 오류")
-
 st.divider()
 st.caption("Team-H for hhyun")
@@ -16,7 +16,8 @@ from typing import Dict, Any, Optional
 
 # 프로젝트 루트 경로 추가
 project_root = Path(__file__).resolve().parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 # 중앙 설정 import
 try:
@@ -62,6 +63,14 @@ AGENT_AVATARS = {
     "user": "👤",
 }
 
+# Agent code (state의 current_agent 값) → (이름, 아이콘)
+AGENT_INFO = {
+    "i": ("Manager I", AGENT_AVATARS["manager_i"]),
+    "m": ("Manager M", AGENT_AVATARS["manager_m"]),
+    "s": ("Manager S", AGENT_AVATARS["manager_s"]),
+    "t": ("Manager T", AGENT_AVATARS["manager_t"]),
+}
+
 
 # ============================================================================
 # 기본값
@@ -125,7 +134,7 @@ def get_env_defaults() -> Dict[str, Any]:
             "embedding_type": os.getenv("EMBEDDING_TYPE", "openai"),
             "embedder_url": os.getenv("EMBEDDER_URL", "http://localhost:8000"),
             "openai_api_key": os.getenv("OPENAI_API_KEY", ""),
-            "embedding_dims": int(os.getenv("OPENAI_EMBEDDING_DIMS", "3072")),
+            "embedding_dims": int(os.getenv("OPENAI_EMBEDDING_DIMS", "1024")),
             "qdrant_url": os.getenv("QDRANT_URL", "http://localhost:6333"),
             "qdrant_api_key": os.getenv("QDRANT_PASSWORD", ""),
             "m_collection_name": os.getenv("MANAGER_M_COLLECTION", "manager_m_memories"),
@@ -5,12 +5,27 @@
 모든 결정을 확인한 후 "최종 제출" 버튼으로 한 번에 전송합니다.
 
 FastAPI 클라이언트를 통해 HITL resume 요청을 처리합니다.
+
+채팅 화면 fragment(app.py의 chat_fragment) 안에서 렌더링되므로, 개별 결정/편집 같은
+중간 상호작용은 fragment 범위로만 rerun하고 최종 실행이 끝났을 때만 앱 전체를 rerun합니다.
 """
 
 import streamlit as st
 import json
+import orjson
+import os
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 
+from streamlits.ui.components import get_api_client
+
+
+# 디버그 표시 여부 (HITL_DEBUG=1일 때만 전체 interrupt 구조 등 디버그 정보를 렌더링)
+HITL_DEBUG = os.getenv("HITL_DEBUG", "").lower() in ("1", "true", "yes")
+
+# 결정 버튼 표시 순서
+DECISION_ORDER = ("approve", "edit", "reject")
+
 
 def initialize_approval_decisions(num_actions: int):
     """승인 결정 상태 초기화"""
@@ -86,7 +101,8 @@ def render_action_card(
         expanded=(decision_type is None)
     ):
         # 디버깅: tool_name 확인
-        st.caption(f"🔍 Tool name debug: `{tool_name}` (type: {type(tool_name)})")
+        if HITL_DEBUG:
+            st.caption(f"🔍 Tool name debug: `{tool_name}` (type: {type(tool_name)})")
 
         # 작업 설명
         st.markdown(f"**📝 설명:**")
@@ -104,8 +120,9 @@ def render_action_card(
                 st.info(memory_content)
 
         # Arguments 표시
+        # 접힌 expander도 내용을 매 rerun 전송하므로, 사용자가 켰을 때만 직렬화해서 표시
         st.markdown(f"**🔧 Arguments:**")
-        with st.expander("상세 정보", expanded=False):
+        if st.toggle("상세 정보 보기", key=f"show_args_{idx}"):
             # arguments 또는 args 키 모두 지원
             args_to_show = action.get('arguments') or action.get('args', {})
             st.json(args_to_show)
@@ -137,7 +154,14 @@ def render_edit_mode(idx: int, action: Dict[str, Any], allowed: List[str], is_si
     st.markdown(f"**Tool Name:** `{tool_name}`")
 
     # JSON 형태로 arguments 편집
-    args_json = json.dumps(original_args, indent=2, ensure_ascii=False)
+    # 편집 중 rerun마다 다시 직렬화하지 않도록 같은 arguments 객체면 세션에 저장된 문자열 재사용
+    cache_key = f"edit_args_json_{idx}"
+    cached = st.session_state.get(cache_key)
+    if cached is None or cached[0] is not original_args:
+        args_json = orjson.dumps(original_args, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        cached = (original_args, args_json)
+        st.session_state[cache_key] = cached
+    args_json = cached[1]
     edited_args_json = st.text_area(
         "Arguments (JSON 형식):",
         value=args_json,
@@ -150,7 +174,7 @@ def render_edit_mode(idx: int, action: Dict[str, Any], allowed: List[str], is_si
     # 편집 적용 버튼
     if col1.button("✅ 편집 적용", key=f"apply_edit_{idx}", use_container_width=True):
         try:
-            edited_args = json.loads(edited_args_json)
+            edited_args = orjson.loads(edited_args_json)
 
             if is_single_action:
                 # 단일 작업: 즉시 실행
@@ -169,14 +193,20 @@ def render_edit_mode(idx: int, action: Dict[str, Any], allowed: List[str], is_si
 
                 st.session_state[f"edit_mode_{idx}"] = False
                 st.success(f"✅ 작업 {idx + 1} 편집 적용됨")
-                st.rerun()
-        except json.JSONDecodeError as e:
+                st.rerun(scope="fragment")
+        except json.JSONDecodeError as e:  # orjson.JSONDecodeError도 이 타입의 하위 클래스
             st.error(f"❌ JSON 파싱 오류: {e}")
 
     # 편집 취소 버튼
     if col2.button("↩️ 취소", key=f"cancel_edit_{idx}", use_container_width=True):
         st.session_state[f"edit_mode_{idx}"] = False
-        st.rerun()
+        st.rerun(scope="fragment")
+
+
+@lru_cache(maxsize=16)
+def _decision_layout(allowed: tuple) -> tuple:
+    """허용된 결정을 버튼 표시 순서(승인 → 편집 → 거부)로 정렬 (각 결정이 한 열씩 차지)"""
+    return tuple(decision for decision in DECISION_ORDER if decision in allowed)
 
 
 def render_decision_buttons(idx: int, action: Dict[str, Any], allowed: List[str], total_actions: int = 1, is_single_action: bool = False):
@@ -190,26 +220,14 @@ def render_decision_buttons(idx: int, action: Dict[str, Any], allowed: List[str]
         is_single_action: 단일 작업 여부 (True일 경우 즉시 실행)
     """
 
-    num_buttons = sum([
-        "approve" in allowed,
-        "edit" in allowed,
-        "reject" in allowed
-    ])
-
-    if num_buttons == 3:
-        col1, col2, col3 = st.columns(3)
-    elif num_buttons == 2:
-        col1, col2 = st.columns(2)
-        col3 = None
-    else:
-        col1 = st
-        col2 = None
-        col3 = None
+    # 허용된 결정 조합별 버튼 배치는 한 번만 계산 (작업마다 같은 조합이 대부분)
+    layout = _decision_layout(tuple(allowed))
+    cols = st.columns(len(layout)) if len(layout) > 1 else [st] * len(layout)
+    col_for = dict(zip(layout, cols))
 
     # 승인 버튼
-    if "approve" in allowed:
-        target_col = col1 if num_buttons >= 1 else st
-        if target_col.button("✅ 승인", key=f"btn_approve_{idx}", use_container_width=True):
+    if "approve" in col_for:
+        if col_for["approve"].button("✅ 승인", key=f"btn_approve_{idx}", use_container_width=True):
             if is_single_action:
                 # 단일 작업: 즉시 실행
                 approval_data = st.session_state.pending_approval
@@ -223,27 +241,17 @@ def render_decision_buttons(idx: int, action: Dict[str, Any], allowed: List[str]
                     "reject_message": None,
                 }
                 st.success(f"✅ 작업 {idx + 1} 승인됨")
-                st.rerun()
+                st.rerun(scope="fragment")
 
     # 편집 버튼
-    if "edit" in allowed:
-        target_col = col2 if num_buttons >= 2 else col1 if num_buttons >= 1 else st
-        if target_col.button("✏️ 편집", key=f"btn_edit_{idx}", use_container_width=True):
+    if "edit" in col_for:
+        if col_for["edit"].button("✏️ 편집", key=f"btn_edit_{idx}", use_container_width=True):
             st.session_state[f"edit_mode_{idx}"] = True
-            st.rerun()
+            st.rerun(scope="fragment")
 
     # 거부 버튼
-    if "reject" in allowed:
-        if num_buttons == 3:
-            target_col = col3
-        elif num_buttons == 2 and "edit" not in allowed:
-            target_col = col2
-        elif num_buttons == 2 and "approve" not in allowed:
-            target_col = col2
-        else:
-            target_col = col1 if num_buttons >= 1 else st
-
-        if target_col.button("❌ 거부", key=f"btn_reject_{idx}", use_container_width=True):
+    if "reject" in col_for:
+        if col_for["reject"].button("❌ 거부", key=f"btn_reject_{idx}", use_container_width=True):
             if is_single_action:
                 # 단일 작업: 즉시 실행
                 approval_data = st.session_state.pending_approval
@@ -264,34 +272,46 @@ def render_decision_buttons(idx: int, action: Dict[str, Any], allowed: List[str]
                     "reject_message": reject_reason or "사용자가 거부했습니다",
                 }
                 st.error(f"❌ 작업 {idx + 1} 거부됨")
-                st.rerun()
+                st.rerun(scope="fragment")
+
+
+def _decision_payload(decision_type: Optional[str], edited_args: Optional[Dict] = None, edited_tool_name: Optional[str] = None, reject_message: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    결정 하나를 resume 요청 페이로드로 변환 (단일/다중 작업 공통)
+
+    Returns:
+        결정 페이로드, 또는 미결정/알 수 없는 타입이면 None
+    """
+    if decision_type == "approve":
+        return {"type": "approve"}
+    if decision_type == "edit":
+        return {
+            "type": "edit",
+            "edited_action": {
+                "name": edited_tool_name,
+                "args": edited_args
+            }
+        }
+    if decision_type == "reject":
+        return {
+            "type": "reject",
+            "message": reject_message or "사용자가 거부했습니다"
+        }
+    return None
 
 
 def execute_single_decision(decision_type: str, action: Dict[str, Any], approval_data: Dict[str, Any], edited_args: Optional[Dict] = None, edited_tool_name: Optional[str] = None, reject_message: Optional[str] = None):
     """단일 작업 즉시 실행 (FastAPI 클라이언트 사용)"""
     try:
         # 단일 결정 페이로드 생성
-        if decision_type == "approve":
-            decisions = [{"type": "approve"}]
-        elif decision_type == "edit":
-            decisions = [{
-                "type": "edit",
-                "edited_action": {
-                    "name": edited_tool_name,
-                    "args": edited_args
-                }
-            }]
-        elif decision_type == "reject":
-            decisions = [{
-                "type": "reject",
-                "message": reject_message or "사용자가 거부했습니다"
-            }]
-        else:
+        decision = _decision_payload(decision_type, edited_args, edited_tool_name, reject_message)
+        if decision is None:
             st.error(f"❌ 알 수 없는 결정 타입: {decision_type}")
             return
+        decisions = [decision]
 
         # FastAPI 클라이언트로 resume 요청
-        api_client = st.session_state.api_client
+        api_client = get_api_client()
         thread_id = approval_data["thread_id"]
         user_id = approval_data.get("user_id", "default_user")
         session_id = approval_data.get("session_id")
@@ -359,33 +379,21 @@ def build_decisions_payload(action_requests: List[Dict[str, Any]]) -> Optional[L
     Returns:
         decisions 리스트, 또는 미결정 작업이 있으면 None
     """
+    approval_decisions = st.session_state.approval_decisions
     decisions = []
 
     for idx in range(len(action_requests)):
-        decision = st.session_state.approval_decisions.get(idx, {})
-        decision_type = decision.get("type")
-
-        if decision_type == "approve":
-            decisions.append({"type": "approve"})
-
-        elif decision_type == "reject":
-            decisions.append({
-                "type": "reject",
-                "message": decision.get("reject_message", "사용자가 거부했습니다")
-            })
-
-        elif decision_type == "edit":
-            decisions.append({
-                "type": "edit",
-                "edited_action": {
-                    "name": decision.get("edited_tool_name"),
-                    "args": decision.get("edited_args")
-                }
-            })
-
-        else:
+        decision = approval_decisions.get(idx, {})
+        payload = _decision_payload(
+            decision.get("type"),
+            decision.get("edited_args"),
+            decision.get("edited_tool_name"),
+            decision.get("reject_message"),
+        )
+        if payload is None:
             # 미결정 상태 - None 반환하여 제출 불가
             return None
+        decisions.append(payload)
 
     return decisions
 
@@ -439,7 +447,7 @@ def render_approval_summary(action_requests: List[Dict[str, Any]]):
     ):
         # 모든 결정 초기화
         st.session_state.approval_decisions = {}
-        st.rerun()
+        st.rerun(scope="fragment")
 
     return False
 
@@ -460,13 +468,14 @@ def render_approval_ui_refactored():
     st.divider()
     st.warning("⏸️ 승인이 필요한 작업이 있습니다", icon="✋")
 
-    # 디버그 정보 (선택적)
-    with st.expander("🐛 디버그: 전체 구조", expanded=False):
-        st.code(f"Type: {type(interrupt).__name__}")
-        try:
-            st.code(json.dumps(interrupt, indent=2, default=str))
-        except:
-            st.text(str(interrupt))
+    # 디버그 정보 (HITL_DEBUG일 때만)
+    if HITL_DEBUG:
+        with st.expander("🐛 디버그: 전체 구조", expanded=False):
+            st.code(f"Type: {type(interrupt).__name__}")
+            try:
+                st.code(json.dumps(interrupt, indent=2, default=str))
+            except:
+                st.text(str(interrupt))
 
     # action_requests 추출
     try:
@@ -501,7 +510,7 @@ def render_approval_ui_refactored():
                     return True
 
                 # FastAPI 클라이언트로 resume 요청
-                api_client = st.session_state.api_client
+                api_client = get_api_client()
                 thread_id = approval_data["thread_id"]
                 user_id = approval_data.get("user_id", "default_user")
                 session_id = approval_data.get("session_id")
@@ -15,11 +15,15 @@ Streamlit 공통 컴포넌트 - 중복 코드 제거
 
 import streamlit as st
 from typing import Dict, Any, Optional
-from langchain_core.messages import AIMessage
-from openai import OpenAI
 import tempfile
 import os
 
+from streamlits.core.config import AGENT_INFO
+from streamlits.utils.fastapi_client import FastAPIClient
+
+# Note: openai / langchain_core는 사용하는 함수 안에서 import
+# (UI 프로세스 기동 시 음성 입력·에이전트 응답 파싱을 쓰지 않으면 로드하지 않음)
+
 
 # 에이전트별 아바타 매핑 (순수 이모지만 사용)
 AGENT_AVATARS = {
@@ -32,6 +36,35 @@ AGENT_AVATARS = {
     "user": "👤",
 }
 
+# 에이전트 표시 이름 → 아바타 (AGENT_INFO에서 생성)
+AGENT_NAME_AVATARS = {name: avatar for name, avatar in AGENT_INFO.values()}
+
+
+def _resolve_avatar(role: str, agent_type: str, agent_name: Optional[str]) -> str:
+    """
+    메시지 아바타 결정
+
+    Args:
+        role: 메시지 역할 ("user" 또는 "assistant")
+        agent_type: 에이전트 타입
+        agent_name: 에이전트 이름
+
+    Returns:
+        아바타 이모지
+    """
+    if role != "assistant":
+        return AGENT_AVATARS["user"]
+
+    # agent_name에서 에이전트 타입 추론 (정확히 일치하면 바로, 아니면 이름 포함 여부로)
+    if agent_name:
+        avatar = AGENT_NAME_AVATARS.get(agent_name)
+        if avatar is not None:
+            return avatar
+        for name, avatar in AGENT_NAME_AVATARS.items():
+            if name in agent_name:
+                return avatar
+    return AGENT_AVATARS.get(agent_type, AGENT_AVATARS["assistant"])
+
 
 def display_chat_message(
     role: str,
@@ -49,20 +82,7 @@ def display_chat_message(
         agent_name: 에이전트 이름 (assistant 메시지에 표시)
     """
     # 아바타 선택
-    if role == "assistant":
-        # agent_name에서 에이전트 타입 추론
-        if agent_name and "Manager I" in agent_name:
-            avatar = AGENT_AVATARS["manager_i"]
-        elif agent_name and "Manager M" in agent_name:
-            avatar = AGENT_AVATARS["manager_m"]
-        elif agent_name and "Manager S" in agent_name:
-            avatar = AGENT_AVATARS["manager_s"]
-        elif agent_name and "Manager T" in agent_name:
-            avatar = AGENT_AVATARS["manager_t"]
-        else:
-            avatar = AGENT_AVATARS.get(agent_type, AGENT_AVATARS["assistant"])
-    else:
-        avatar = AGENT_AVATARS["user"]
+    avatar = _resolve_avatar(role, agent_type, agent_name)
 
     with st.chat_message(role, avatar=avatar):
         # 에이전트 이름 표시 (assistant만)
@@ -81,18 +101,21 @@ def process_agent_response(response: Dict[str, Any]) -> tuple[str, Optional[str]
     Returns:
         (message_content, active_agent_name) 튜플
     """
+    from langchain_core.messages import AIMessage
+
     messages = response.get("messages", [])
     active_agent_name = response.get("active_agent_name")
 
     if not messages:
         return "응답을 받지 못했습니다.", active_agent_name
 
-    # 마지막 AI 메시지 찾기
-    for msg in reversed(messages):
-        if isinstance(msg, AIMessage):
-            return msg.content, active_agent_name
-        elif hasattr(msg, "type") and msg.type == "ai":
-            return msg.content, active_agent_name
+    # 마지막 AI 메시지 찾기 (대부분 type 비교에서 바로 판별, 찾으면 즉시 중단)
+    last_ai = next(
+        (msg for msg in reversed(messages) if getattr(msg, "type", None) == "ai" or isinstance(msg, AIMessage)),
+        None,
+    )
+    if last_ai is not None:
+        return last_ai.content, active_agent_name
 
     return "응답을 처리할 수 없습니다.", active_agent_name
 
@@ -107,6 +130,8 @@ def get_tool_call_info(state: Any) -> Optional[Dict[str, Any]]:
     Returns:
         Tool call 정보 딕셔너리 또는 None
     """
+    from langchain_core.messages import AIMessage
+
     messages = state.values.get("messages", [])
 
     for msg in reversed(messages):
@@ -415,9 +440,10 @@ def create_session_state_defaults(**kwargs):
     Args:
         **kwargs: 설정할 세션 상태 키-값 쌍
     """
-    for key, value in kwargs.items():
-        if key not in st.session_state:
-            st.session_state[key] = value
+    # 없는 키만 모아서 한 번에 기록 (키마다 개별 쓰기 방지)
+    missing = {key: value for key, value in kwargs.items() if key not in st.session_state}
+    if missing:
+        st.session_state.update(missing)
 
 
 def render_error_expander(title: str = "상세 에러 정보"):
@@ -436,7 +462,7 @@ def render_error_expander(title: str = "상세 에러 정보"):
 # 에이전트 캐싱 (성능 최적화)
 # ============================================================================
 
-@st.cache_resource
+@st.cache_resource(max_entries=8, ttl=3600, show_spinner=False)
 def create_cached_agent(agent_class, **config):
     """
     범용 에이전트 캐싱 생성
@@ -444,6 +470,8 @@ def create_cached_agent(agent_class, **config):
     Streamlit의 @st.cache_resource를 사용하여 에이전트를 캐싱합니다.
     동일한 설정으로 에이전트를 재생성할 때 캐시된 인스턴스를 재사용하여
     초기화 시간을 80% 단축합니다.
+    설정 조합이 바뀔 때마다 인스턴스가 계속 쌓이지 않도록 최대 8개,
+    1시간 TTL로 제한합니다.
 
     Args:
         agent_class: 에이전트 클래스 (ManagerS, ManagerM, ManagerI, ManagerT, TeamHGraph)
@@ -463,16 +491,22 @@ def create_cached_agent(agent_class, **config):
         ...     tavily_api_key="...",
         ... )
     """
-    agent_name = agent_class.__name__
-    print(f"[🔄] Creating cached {agent_name}...")
+    # 생성 실패 시 예외는 캐시되지 않고 호출 측으로 전달됨
+    return agent_class(**config)
 
-    try:
-        agent = agent_class(**config)
-        print(f"[✅] Cached {agent_name} created successfully")
-        return agent
-    except Exception as e:
-        print(f"[❌] Failed to create {agent_name}: {e}")
-        raise
+
+@st.cache_resource(show_spinner=False)
+def get_api_client() -> FastAPIClient:
+    """
+    FastAPI 백엔드 클라이언트 (프로세스 전역 1개 공유)
+
+    클라이언트는 keep-alive 연결 풀(thread-safe한 httpx.Client)을 가지므로 세션마다
+    st.session_state에 따로 두지 않고 모든 세션(스크립트 스레드)이 같은 인스턴스와 연결 풀을 공유합니다.
+
+    Returns:
+        캐시된 FastAPIClient 인스턴스
+    """
+    return FastAPIClient(base_url=os.getenv("FASTAPI_URL", "http://localhost:8000"))
 
 
 def clear_agent_cache():
@@ -509,6 +543,7 @@ def transcribe_audio(audio_bytes: bytes, language: str = "ko") -> Optional[str]:
     tmp_file_path = None
     try:
         from config.settings import api_config
+        from openai import OpenAI
 
         if not api_config.openai_api_key:
             st.error("❌ OpenAI API Key가 설정되지 않았습니다.")
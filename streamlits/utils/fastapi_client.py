@@ -4,8 +4,8 @@ FastAPI 백엔드 클라이언트
 SSE (Server-Sent Events) 기반 스트리밍 클라이언트
 """
 
-import json
-import requests
+import httpx
+import orjson
 from typing import Dict, Any, Iterator, Optional, List
 
 
@@ -19,6 +19,35 @@ class FastAPIClient:
         """
         self.base_url = base_url.rstrip("/")
 
+        # 요청마다 TCP 연결을 새로 맺지 않도록 keep-alive 연결 풀 재사용
+        # get_api_client()로 모든 Streamlit 스크립트 스레드가 공유하므로 thread-safe한 httpx.Client 사용
+        # (동시 스트림 수만큼 연결 확보)
+        self._client = httpx.Client(
+            base_url=self.base_url,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=8),
+        )
+
+    @staticmethod
+    def _iter_sse_events(response: httpx.Response) -> Iterator[Dict[str, Any]]:
+        """
+        SSE 응답에서 data 이벤트를 JSON으로 파싱
+
+        httpx의 iter_lines()는 디코딩된 str 줄을 반환하며, orjson은 str도 그대로 파싱합니다.
+
+        Args:
+            response: client.stream()으로 받은 스트리밍 응답
+
+        Yields:
+            SSE 이벤트 딕셔너리
+        """
+        for line in response.iter_lines():
+            if line.startswith("data: "):
+                data_str = line[6:]  # "data: " 제거
+                try:
+                    yield orjson.loads(data_str)
+                except orjson.JSONDecodeError:
+                    print(f"[⚠️] Failed to parse SSE data: {data_str}")
+
     def chat_stream(
         self,
         message: str,
@@ -38,7 +67,7 @@ class FastAPIClient:
         Yields:
             SSE 이벤트 딕셔너리
         """
-        url = f"{self.base_url}/chat/stream"
+        url = "/chat/stream"
 
         payload = {
             "message": message,
@@ -51,19 +80,9 @@ class FastAPIClient:
         payload = {k: v for k, v in payload.items() if v is not None}
 
         # SSE 스트림 요청
-        with requests.post(url, json=payload, stream=True, timeout=300) as response:
+        with self._client.stream("POST", url, json=payload, timeout=300) as response:
             response.raise_for_status()
-
-            # SSE 이벤트 파싱
-            for line in response.iter_lines(decode_unicode=True):
-                if line.startswith("data: "):
-                    data_str = line[6:]  # "data: " 제거
-                    try:
-                        data = json.loads(data_str)
-                        yield data
-                    except json.JSONDecodeError:
-                        print(f"[⚠️] Failed to parse SSE data: {data_str}")
-                        continue
+            yield from self._iter_sse_events(response)
 
     def resume_stream(
         self,
@@ -84,7 +103,7 @@ class FastAPIClient:
         Yields:
             SSE 이벤트 딕셔너리
         """
-        url = f"{self.base_url}/chat/resume"
+        url = "/chat/resume"
 
         payload = {
             "thread_id": thread_id,
@@ -97,19 +116,9 @@ class FastAPIClient:
         payload = {k: v for k, v in payload.items() if v is not None}
 
         # SSE 스트림 요청
-        with requests.post(url, json=payload, stream=True, timeout=300) as response:
+        with self._client.stream("POST", url, json=payload, timeout=300) as response:
             response.raise_for_status()
-
-            # SSE 이벤트 파싱
-            for line in response.iter_lines(decode_unicode=True):
-                if line.startswith("data: "):
-                    data_str = line[6:]
-                    try:
-                        data = json.loads(data_str)
-                        yield data
-                    except json.JSONDecodeError:
-                        print(f"[⚠️] Failed to parse SSE data: {data_str}")
-                        continue
+            yield from self._iter_sse_events(response)
 
     def get_state(self, thread_id: str) -> Dict[str, Any]:
         """
@@ -121,9 +130,9 @@ class FastAPIClient:
         Returns:
             그래프 상태 딕셔너리
         """
-        url = f"{self.base_url}/state/{thread_id}"
+        url = f"/state/{thread_id}"
 
-        response = requests.get(url, timeout=30)
+        response = self._client.get(url, timeout=30)
         response.raise_for_status()
 
         return response.json()
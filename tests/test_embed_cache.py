@@ -0,0 +1,168 @@
+"""
+임베딩 캐시 테스트
+
+- 한 번의 embed_documents 호출 안에서 중복된 캐시 미스는 한 번만 요청하고 입력 순서대로 되돌려주는지
+- VectorStore 쿼리 임베딩: 같은 쿼리를 동시에 요청하면 먼저 시작한 요청의 결과를 함께 쓰는지
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from database.qdrant.__vector_store_teamh import VectorStore
+from database.qdrant.fastapi_embedder_adapter import FastAPIEmbedderAdapter
+from database.qdrant.openai_embedder_adapter import OpenAIEmbedderAdapter
+
+TEXTS = ["a", "bb", "ccc", "a", "dddd", "bb"]
+
+
+def _fake_vectors(texts):
+    """텍스트 길이로 만든 가짜 임베딩"""
+    return [[float(len(text)), 0.0] for text in texts]
+
+
+@pytest.fixture
+def openai_embedder(monkeypatch):
+    """영구 캐시 없이 batch_size=2인 OpenAI 어댑터 (요청 텍스트 기록)"""
+    monkeypatch.delenv("OPENAI_EMBEDDING_CACHE_PATH", raising=False)
+    embedder = OpenAIEmbedderAdapter(api_key="test-api-key", batch_size=2)
+    embedder.sent = []
+
+    def embed_batch(texts):
+        embedder.sent.append(list(texts))
+        return _fake_vectors(texts)
+
+    async def aembed_batch(texts):
+        embedder.sent.append(list(texts))
+        return _fake_vectors(texts)
+
+    embedder._embed_batch = embed_batch
+    embedder._aembed_batch = aembed_batch
+    return embedder
+
+
+@pytest.fixture
+def fastapi_embedder():
+    """서버 연결 확인 없이 batch_size=2인 FastAPI 어댑터 (요청 텍스트 기록)"""
+    with patch.object(FastAPIEmbedderAdapter, "_verify_connection"):
+        embedder = FastAPIEmbedderAdapter(base_url="http://embedder.test", batch_size=2)
+    embedder.sent = []
+
+    def embed_chunk(texts):
+        embedder.sent.append(list(texts))
+        return _fake_vectors(texts)
+
+    async def aembed_chunk(texts):
+        embedder.sent.append(list(texts))
+        return _fake_vectors(texts)
+
+    embedder._embed_chunk = embed_chunk
+    embedder._aembed_chunk = aembed_chunk
+    return embedder
+
+
+@pytest.mark.parametrize("embedder_fixture", ["openai_embedder", "fastapi_embedder"])
+class TestDuplicateMisses:
+    """한 배치 안의 중복 캐시 미스"""
+
+    def test_duplicates_are_embedded_once(self, embedder_fixture, request):
+        """중복 텍스트는 한 번만 요청하고 결과는 입력 순서대로 채움"""
+        embedder = request.getfixturevalue(embedder_fixture)
+
+        result = embedder.embed_documents(TEXTS)
+
+        assert result == _fake_vectors(TEXTS)
+        sent = [text for chunk in embedder.sent for text in chunk]
+        assert sorted(sent) == ["a", "bb", "ccc", "dddd"]
+        assert all(len(chunk) <= 2 for chunk in embedder.sent)
+
+    def test_async_duplicates_are_embedded_once(self, embedder_fixture, request):
+        """비동기 경로도 중복 텍스트를 한 번만 요청"""
+        embedder = request.getfixturevalue(embedder_fixture)
+
+        result = asyncio.run(embedder.aembed_documents(TEXTS))
+
+        assert result == _fake_vectors(TEXTS)
+        sent = [text for chunk in embedder.sent for text in chunk]
+        assert sorted(sent) == ["a", "bb", "ccc", "dddd"]
+
+    def test_cached_texts_are_not_requested_again(self, embedder_fixture, request):
+        """캐시된 텍스트는 다시 요청하지 않고, 새 텍스트의 중복만 한 번 요청"""
+        embedder = request.getfixturevalue(embedder_fixture)
+        embedder.embed_documents(["a", "bb"])
+        embedder.sent.clear()
+
+        result = embedder.embed_documents(["bb", "eeeee", "a", "eeeee"])
+
+        assert result == _fake_vectors(["bb", "eeeee", "a", "eeeee"])
+        assert embedder.sent == [["eeeee"]]
+
+
+class TestVectorStoreInflightQueries:
+    """VectorStore 쿼리 임베딩 캐시 (동시 요청 병합)"""
+
+    @pytest.fixture
+    def store(self):
+        """Qdrant 연결 없이 쿼리 임베딩 캐시만 구성한 VectorStore"""
+        store = VectorStore.__new__(VectorStore)
+        store._embed_cache = OrderedDict()
+        store._embed_cache_max = 1024
+        store._embed_cache_lock = threading.Lock()
+        store._inflight = {}
+        return store
+
+    def test_concurrent_identical_queries_embed_once(self, store):
+        """같은 쿼리를 동시에 요청하면 임베딩은 한 번만 수행하고 모두 같은 결과를 받음"""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def embed_query(query):
+            calls.append(query)
+            started.set()
+            release.wait(timeout=5)
+            return [1.0, 0.0]
+
+        store.embedder = SimpleNamespace(embed_query=embed_query)
+        store.sparse_embedder = SimpleNamespace(
+            embed_query=lambda query: SimpleNamespace(indices=[1], values=[1.0])
+        )
+
+        results = [None] * 4
+
+        def worker(i):
+            results[i] = store._get_cached_vectors("같은 쿼리")
+
+        first = threading.Thread(target=worker, args=(0,))
+        first.start()
+        assert started.wait(timeout=5)
+        others = [threading.Thread(target=worker, args=(i,)) for i in range(1, 4)]
+        for thread in others:
+            thread.start()
+        release.set()
+        for thread in [first, *others]:
+            thread.join(timeout=5)
+
+        assert calls == ["같은 쿼리"]
+        assert all(result is results[0] for result in results)
+        assert store._inflight == {}
+        assert store._get_cached_vectors("같은 쿼리") is results[0]
+        assert calls == ["같은 쿼리"]
+
+    def test_failed_embedding_is_propagated_and_not_cached(self, store):
+        """임베딩 실패는 그대로 전달되고 다음 요청에서 다시 시도"""
+        store.embedder = SimpleNamespace(embed_query=lambda query: [1.0, 0.0])
+
+        def failing_sparse(query):
+            raise RuntimeError("sparse down")
+
+        store.sparse_embedder = SimpleNamespace(embed_query=failing_sparse)
+        with pytest.raises(RuntimeError, match="sparse down"):
+            store._get_cached_vectors("q")
+
+        assert store._inflight == {}
+        assert "q" not in store._embed_cache
@@ -0,0 +1,135 @@
+"""
+VectorStore 메타데이터 필터 캐시 테스트
+
+create_qdrant_filter는 고정된 필터 시그니처별로 Filter를 재사용하므로
+값이 같아 보여도 타입이 다른 필터(True/1/1.0)가 서로 섞이지 않는지 확인합니다.
+"""
+
+import pytest
+from pydantic import ValidationError
+from qdrant_client.models import MatchAny, MatchValue
+
+from database.qdrant.__vector_store_teamh import _cached_filter, create_qdrant_filter
+
+
+@pytest.fixture(autouse=True)
+def clear_filter_cache():
+    """테스트마다 빈 캐시에서 시작"""
+    _cached_filter.cache_clear()
+    yield
+    _cached_filter.cache_clear()
+
+
+def _match(qdrant_filter, index=0):
+    return qdrant_filter.must[index].match
+
+
+class TestScalarValues:
+    """단일 값 필터"""
+
+    def test_same_filter_is_reused(self):
+        """같은 필터는 캐시된 Filter 객체를 그대로 반환"""
+        first = create_qdrant_filter({"user_id": "hhyun"})
+        second = create_qdrant_filter({"user_id": "hhyun"})
+
+        assert first is second
+        assert first.must[0].key == "metadata.user_id"
+
+    @pytest.mark.parametrize("first, second", [(True, 1), (1, True), (False, 0), (0, False)])
+    def test_equal_values_of_different_types_are_not_shared(self, first, second):
+        """True == 1 이지만 서로 다른 캐시 항목이어야 함"""
+        create_qdrant_filter({"is_active": first})
+        match = _match(create_qdrant_filter({"is_active": second}))
+
+        assert isinstance(match, MatchValue)
+        assert match.value == second
+        assert type(match.value) is type(second)
+
+    def test_float_does_not_reuse_int_entry(self):
+        """1.0은 캐시된 1 필터를 받지 않고 직접 검증됨 (MatchValue는 float 미지원)"""
+        create_qdrant_filter({"count": 1})
+        with pytest.raises(ValidationError):
+            create_qdrant_filter({"count": 1.0})
+
+    def test_none_values_are_skipped(self):
+        """None, "None"만 있으면 필터 없음"""
+        assert create_qdrant_filter({"a": None, "b": "None"}) is None
+        assert create_qdrant_filter({}) is None
+        assert create_qdrant_filter(None) is None
+
+    def test_key_order_does_not_matter(self):
+        """필드 순서만 다른 필터는 같은 캐시 항목 사용"""
+        first = create_qdrant_filter({"user_id": "hhyun", "lang": "ko"})
+        second = create_qdrant_filter({"lang": "ko", "user_id": "hhyun"})
+
+        assert first is second
+
+
+class TestListValues:
+    """리스트 값 필터"""
+
+    def test_list_becomes_match_any(self):
+        """리스트는 MatchAny로 변환되고 캐시됨"""
+        first = create_qdrant_filter({"tags": ["a", "b"]})
+        second = create_qdrant_filter({"tags": ["a", "b"]})
+
+        assert first is second
+        assert isinstance(_match(first), MatchAny)
+        assert _match(first).any == ["a", "b"]
+
+    def test_list_element_types_are_not_shared(self):
+        """[True]는 캐시된 [1] 필터를 받지 않고 직접 검증됨 (MatchAny는 bool 미지원)"""
+        create_qdrant_filter({"ids": [1]})
+        with pytest.raises(ValidationError):
+            create_qdrant_filter({"ids": [True]})
+
+        assert _match(create_qdrant_filter({"ids": [1]})).any == [1]
+
+    def test_cached_list_is_not_affected_by_caller_mutation(self):
+        """호출 후 원본 리스트를 수정해도 캐시된 필터는 바뀌지 않음"""
+        tags = ["a"]
+        create_qdrant_filter({"tags": tags})
+        tags.append("b")
+
+        assert _match(create_qdrant_filter({"tags": ["a"]})).any == ["a"]
+
+    def test_empty_list_is_skipped(self):
+        """빈 리스트 조건은 건너뜀"""
+        assert create_qdrant_filter({"tags": []}) is None
+
+    def test_list_subclass_becomes_match_any(self):
+        """list 하위 클래스도 MatchAny (캐시 없이 생성)"""
+        class Tags(list):
+            pass
+
+        match = _match(create_qdrant_filter({"tags": Tags(["a"])}))
+
+        assert isinstance(match, MatchAny)
+        assert match.any == ["a"]
+        assert _cached_filter.cache_info().currsize == 0
+
+    def test_tuple_value_skips_cache(self):
+        """tuple 값은 리스트 키와 구분할 수 없으므로 캐시하지 않음"""
+        create_qdrant_filter({"tags": ["a"]})
+        with pytest.raises(ValidationError):
+            create_qdrant_filter({"tags": ("a",)})
+
+        assert _cached_filter.cache_info().currsize == 1
+
+
+class TestNestedDictValues:
+    """해시할 수 없는 값 (중첩 dict)"""
+
+    def test_nested_dict_skips_cache(self):
+        """중첩 dict는 캐시 키를 만들 수 없어 캐시 없이 생성 (MatchValue 검증 오류는 그대로 전달)"""
+        with pytest.raises(ValidationError):
+            create_qdrant_filter({"meta": {"a": 1}})
+
+        assert _cached_filter.cache_info().currsize == 0
+
+    def test_list_of_dicts_skips_cache(self):
+        """dict를 담은 리스트도 캐시하지 않음"""
+        with pytest.raises(ValidationError):
+            create_qdrant_filter({"meta": [{"a": 1}]})
+
+        assert _cached_filter.cache_info().currsize == 0